@@ -0,0 +1,135 @@
+"""Micro-benchmarks for the dull parser.
+
+Run from the project root:
+    python -m dull_dsl.do_bench_parser
+
+- bench_classify: compiled LineClassifier vs the linear scan of
+  all_clauses_by_priority that assess_line used to do
+- bench_emoji: util_emoji fast path vs calling the emoji package on every line
+"""
+
+import glob
+import sys
+import time
+from typing import List
+
+import emoji
+
+from utils.util_fmk import read_lines
+from utils.util_emoji import might_have_emoji, strip_emoji
+from dull_dsl.dull_parser_classes import LineClassifier, LineType
+
+MODEL_DOCS = "ldm/ldm_models/*/*.md"
+TARGET_LINES = 10000  # about the size of our big production models
+
+
+def bench_lines(target_lines: int = TARGET_LINES) -> List[str]:
+    """All the model documents, repeated until there are target_lines lines."""
+    doc_lines = []
+    for path in sorted(glob.glob(MODEL_DOCS)):
+        doc_lines.extend(read_lines(path))
+    if not doc_lines:
+        print(f"No model documents found for {MODEL_DOCS}")
+        return []
+    lines = []
+    while len(lines) < target_lines:
+        lines.extend(doc_lines)
+    return lines
+
+
+def bare_lines(lines: List[str]) -> List[str]:
+    """The lines as assess_line hands them to the clause specs."""
+    bare = []
+    for line in lines:
+        trimmed = line.strip()
+        if not trimmed:
+            continue
+        if might_have_emoji(trimmed):
+            trimmed = strip_emoji(trimmed)
+        bare.append(trimmed)
+    return bare
+
+
+def linear_classify(line_types: List[LineType], trimmed: str) -> LineType:
+    for line_type in line_types:
+        if line_type.matches(trimmed):
+            return line_type
+    return None
+
+
+def time_it(caption: str, fn, repeats: int = 5) -> float:
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    print(f"\t{caption:<32} {best * 1000:9.2f} ms")
+    return best
+
+
+def bench_classify(dull_specs, lines: List[str]):
+    line_types = dull_specs["all_clauses_by_priority"]
+    bare = bare_lines(lines)
+    print(f"\nClassifying {len(bare)} non-blank lines with {len(line_types)} clause specs")
+
+    start = time.perf_counter()
+    classifier = LineClassifier(line_types)
+    compile_ms = (time.perf_counter() - start) * 1000
+    print(f"\tcompiled {len(classifier.line_types)} distinct specs in {compile_ms:.2f} ms")
+
+    mismatches = 0
+    for trimmed in bare:
+        expected = linear_classify(line_types, trimmed)
+        if classifier.classify(trimmed) is not expected:
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"\tMISMATCH: {trimmed}")
+    if mismatches:
+        print(f"\t{mismatches} lines classified differently!")
+
+    linear = time_it("linear scan", lambda: [linear_classify(line_types, t) for t in bare])
+    compiled = time_it("compiled classifier", lambda: [classifier.classify(t) for t in bare])
+    print(f"\tspeedup: {linear / compiled:.1f}x")
+
+
+def package_bare(trimmed: str) -> str:
+    # what assess_line did before the fast path
+    if emoji.emoji_list(trimmed):
+        return emoji.replace_emoji(trimmed, "").strip()
+    return trimmed
+
+
+def fast_bare(trimmed: str) -> str:
+    if might_have_emoji(trimmed):
+        return strip_emoji(trimmed)
+    return trimmed
+
+
+def bench_emoji(lines: List[str]):
+    trimmed_lines = [line.strip() for line in lines if line.strip()]
+    with_emoji = sum(1 for t in trimmed_lines if emoji.emoji_list(t))
+    print(f"\nStripping emojis from {len(trimmed_lines)} non-blank lines ({with_emoji} have emojis)")
+
+    mismatches = 0
+    for trimmed in trimmed_lines:
+        if fast_bare(trimmed) != package_bare(trimmed):
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"\tMISMATCH: {trimmed}")
+    if mismatches:
+        print(f"\t{mismatches} lines stripped differently!")
+
+    package = time_it("emoji package on every line", lambda: [package_bare(t) for t in trimmed_lines])
+    fast = time_it("fast path", lambda: [fast_bare(t) for t in trimmed_lines])
+    print(f"\tspeedup: {package / fast:.1f}x")
+
+
+if __name__ == "__main__":
+    from ldm.do_build_ldm import ldm_dull_specs
+
+    target = int(sys.argv[1]) if len(sys.argv) > 1 else TARGET_LINES
+    lines = bench_lines(target)
+    bench_classify(ldm_dull_specs, lines)
+    bench_emoji(lines)
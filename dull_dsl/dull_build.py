@@ -1,5 +1,6 @@
 import sys
-from utils.util_fmk import write_text
+import time
+from utils.util_fmk import write_text, open_text
 from utils.util_json import as_json, write_yaml, write_json, as_yaml, make_tidy_yaml
 from utils.util_fmk import create_fresh_directory
 
@@ -13,13 +14,22 @@ import utils.util_all_fmk as fmk
 
 from ldm.ldm_validators_core import countEmbellishments
 
-from dull_dsl.dull_parser import parse_model_doc
-from utils.util_pydantic import gen_schema
+from dull_dsl.dull_parser import (
+    parse_model_doc,
+    derive_dict_streaming,
+    derive_model_streaming,
+    parse_model_doc_incrementally,
+)
+from dull_dsl.dull_parser_core import DocPart
+from dull_dsl.dull_parser_classes import PreviousParses
+from dull_dsl.dull_parse_cache import parse_cache_key, load_cached_parse, store_cached_parse
+from ldm.ldm_parse_fns import parse_cache_stats
+from dull_dsl.dull_metamodel_cache import write_metamodel_artifacts, metamodel_validator
 
 from dataclasses import fields
 
 import ldm.Literate_01 as Literate_01
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
 models_dir = ""
 model_dir = ""
@@ -36,10 +46,13 @@ The_Extract_Path = None
 from utils.util_pydantic import TYPE_REGISTRY, dataclass, USING_PYDANTIC
 from ldm.Literate_01 import *
 
-from utils.util_inspect import inspect_module
 from ldm.ldm_extractors import create_model_extract_with_faculty
 
-def build_dull_dsl(dull_specs: Dict):
+def build_dull_dsl(dull_specs: Dict, previous_parses: PreviousParses = None):
+    """
+    Builds the model named in dull_specs. To rebuild as the model is edited,
+    pass the same previous_parses each time: only the edited parts are parsed again.
+    """
 
     global model_assets_dir, model_diagrams_dir
     models_dir = dull_specs["models_dir"]
@@ -85,17 +98,17 @@ def build_dull_dsl(dull_specs: Dict):
     print("Rediirecting to: ", trace_path)
     sys.stdout = open(trace_path, "w", encoding="utf-8")
 
-    #    start by capturing the schema
+    #    start by capturing the schema - made again only when the metamodel's changed
     show_phase("Creating schema and survey of Literate_01")
-    gen_schema(
+    metamodel = write_metamodel_artifacts(
+        dull_specs,
+        Literate_01,
         LiterateModel,
-        f"LiterateMetaModel_01_{pd_or_not}",
         f"{results_dir}/LiterateMeta",
+        f"LiterateMetaModel_01_{pd_or_not}",
+        "LiterateMetaModel_survey.txt",
     )
     model_schema_path = f"{results_dir}/LiterateMeta/LiterateMetaModel_01_{pd_or_not}_schema.yaml"
-    inspect_module(
-        Literate_01, "LiterateMetaModel_survey.txt", f"{results_dir}/LiterateMeta"
-    )
 
     yaml_dict_path = f"{results_dir}/{model_name}_{pd_or_not}_02.dict.yaml"
     yaml_model_path = f"{results_dir}/{model_name}_{pd_or_not}_03.model.yaml"
@@ -110,42 +123,42 @@ def build_dull_dsl(dull_specs: Dict):
         for k, v in TYPE_REGISTRY.items():
             print(k, " -> ", v)
 
-    show_phase(f"Parsing model: {model_doc_path}")
-    doc_part = parse_model_doc(dull_specs, model_doc_path)
-    displayed = doc_part.displayed()
-
-    write_text(f"{results_dir}/{model_name}_01.parsed.txt", displayed)
-
-    show_phase("Deriving dict from parse => {yaml_dict_file}")
-    the_dict = doc_part.derive_dict_for_document(dull_specs)
-    ldms = the_dict.get("literate_models", [])
-    if not ldms:
-        print("No LiterateModels found in the dictionary")
-        return
-    the_ldm_dict = ldms[0]
+    # the _02 dict and _03 model yamls are for looking at; the model itself
+    # is built straight from the parse when they're not wanted
+    write_dict_yaml = dull_specs.get("write_dict_yaml", True)
 
-    the_ldm_dict = TypedDict(the_ldm_dict)
-    the_ldm_dict.save_as(yaml_dict_path)
-    show_phase(f".. full dict saved  in {yaml_dict_path}")
-
-    the_ldm_model_py: LiterateModel = None
-    CREATING_WITH_PYDANTIC = True
-    if CREATING_WITH_PYDANTIC:
-        show_phase(
-            f"Creating model with from_typed_dict() => to_typed_dict() => {yaml_model_path}"
+    # an unchanged model (and grammar) needn't be parsed again
+    use_parse_cache = dull_specs.get("parse_cache", False)
+    cached_parse = None
+    if use_parse_cache:
+        parse_key = parse_cache_key(
+            dull_specs, model_doc_path, code_modules=[LiterateModel.__module__, "utils.util_pydantic"]
         )
-        print("Calling LiterateModel.from_typed_dict ...")
-        the_ldm_model_py = Literate_01.LiterateModel.from_typed_dict(the_ldm_dict)
-        show_phase("have py  model from dict")
+        cached_parse = load_cached_parse(dull_specs, parse_key)
+        if cached_parse and write_dict_yaml and cached_parse[0] is None:
+            cached_parse = None  # cached by a build that didn't derive the dict
+
+    if cached_parse:
+        show_phase(f"Model and grammar unchanged - using the cached parse of {model_doc_path}")
+        (the_ldm_dict, the_ldm_model_py) = cached_parse
+    else:
+        parsed = parse_to_model(dull_specs, model_doc_path, results_dir, model_name, write_dict_yaml, previous_parses)
+        if not parsed:
+            return
+        (the_ldm_dict, the_ldm_model_py) = parsed
+        if use_parse_cache:
+            # before validation adds to the model
+            store_cached_parse(dull_specs, parse_key, parsed)
+
+    if write_dict_yaml:
+        the_ldm_dict.save_as(yaml_dict_path)
+        show_phase(f".. full dict saved  in {yaml_dict_path}")
 
         show_phase(f"Creating model_dict from model => {yaml_model_path}")  # _03_
         # the_ldm_dict = the_ldm_model_py.to_typed_dict()
         the_ldm_dict = TypedDict(the_ldm_model_py)
         the_ldm_dict.save_as(yaml_model_path)
 
-    else:
-        show_phase("Skipping Pydantic model creation from dict")
-
     show_phase("Testing containers")
     # test_containers(the_ldm_model_py)
     # exit(0)
@@ -206,7 +219,9 @@ def build_dull_dsl(dull_specs: Dict):
     from utils.util_jsonschema import validate_to_schema
     show_phase("Validating to JSON Schema - on json model")
 
-    validate_to_schema(schema_path=model_schema_path, object_path=valid_model_jpath)
+    validate_to_schema(
+        schema_path=model_schema_path, object_path=valid_model_jpath, validator=metamodel_validator(metamodel)
+    )
 
     RENDER_MD = False
     if RENDER_MD:
@@ -263,7 +278,94 @@ def build_dull_dsl(dull_specs: Dict):
         pdf_path2a = pdf_path2.replace(".pdf", ".twoup.pdf")
         set_pdf_viewing(pdf_path2, pdf_path2a)
 
+
+def parse_to_model(
+    dull_specs: Dict,
+    model_doc_path: str,
+    results_dir: str,
+    model_name: str,
+    write_dict_yaml: bool,
+    previous_parses: PreviousParses = None,
+):
+    """
+    Parse the model doc and build its first LiterateModel.
+    Returns (the model's dict - if write_dict_yaml, else None - and the model), or None if there's no model.
+    """
+    the_ldm_dict = None
+    if dull_specs.get("stream_parse", False) and not write_dict_yaml:
+        # for very large models: each part's objects are built as it closes, and no
+        # dicts are kept - nor a complete parse tree to write to _01.parsed.txt
+        show_phase(f"Parsing model (streaming) and creating it part by part: {model_doc_path}")
+        the_ldm_model_py = derive_model_streaming(dull_specs, model_doc_path)
+        show_parse_statistics()
+        if the_ldm_model_py is None:
+            print("No LiterateModels found in the parse")
+            return None
+        show_phase("have py  model")
+        return (None, the_ldm_model_py)
+
+    if dull_specs.get("stream_parse", False):
+        # parts are derived as they close, but the dicts are kept, for the dict yaml
+        show_phase(f"Parsing model (streaming) and deriving dict: {model_doc_path}")
+        (doc_part, the_dict) = derive_dict_streaming(dull_specs, model_doc_path)
+    else:
+        show_phase(f"Parsing model: {model_doc_path}")
+        if previous_parses is not None:
+            # rebuilds in the same session only reparse what was edited
+            doc_part = parse_model_doc_incrementally(dull_specs, model_doc_path, previous_parses)
+        else:
+            doc_part = parse_model_doc(dull_specs, model_doc_path)
+
+        if dull_specs.get("write_parse_trace", True):
+            with open_text(f"{results_dir}/{model_name}_01.parsed.txt") as trace_file:
+                doc_part.write_display(trace_file)
+
+        if write_dict_yaml:
+            show_phase("Deriving dict from parse => {yaml_dict_file}")
+            the_dict = doc_part.derive_dict_for_document(dull_specs)
+
+    show_parse_statistics()
+    model_parts = [
+        part for part in doc_part.items if isinstance(part, DocPart) and part.part_type == "LiterateModel"
+    ]
+    if not model_parts:
+        print("No LiterateModels found in the parse")
+        return None
+
+    if write_dict_yaml:
+        the_ldm_dict = TypedDict(the_dict["literate_models"][0])
+
+    the_ldm_model_py: LiterateModel = None
+    CREATING_WITH_PYDANTIC = True
+    if CREATING_WITH_PYDANTIC:
+        # from the part's dict if it was derived above; otherwise straight from the parse
+        show_phase("Creating model from the parse")
+        the_ldm_model_py = model_parts[0].derive_object_for_document(dull_specs)
+        if not write_dict_yaml and not dull_specs.get("stream_parse", False):
+            # the rest of the document is derived as it is for the dict - so it fails the same way
+            for part in doc_part.items:
+                if isinstance(part, DocPart) and part is not model_parts[0]:
+                    part.derive_dict_for_document(dull_specs)
+        show_phase("have py  model")
+
+    else:
+        show_phase("Skipping Pydantic model creation from dict")
+
+    return (the_ldm_dict, the_ldm_model_py)
+
+
+def show_parse_statistics():
+    show_phase("Parse statistics")
+    for (what, stats) in parse_cache_stats().items():
+        print(f"\t{what}: {stats['hits']} cache hits, {stats['misses']} misses, {stats['cached']} cached")
+
+
+# (caption, time.perf_counter()) as each phase starts; do_bench_pipeline times the phases from it
+phase_log: List[Tuple[str, float]] = []
+
+
 def show_phase(caption: str):
+    phase_log.append((caption, time.perf_counter()))
     print(f"\nPhase: {caption}", file=sys.stderr)
     print(f"\nPhase: {caption}")
 
@@ -0,0 +1,123 @@
+"""
+Cache of what's made from the metamodel alone - the JSON schema of
+LiterateModel and the survey of the Literate_01 module - so a build doesn't
+make them again until the metamodel's code changes.
+
+An entry is keyed on the source of the metamodel module and of the modules
+its classes come from (class_pom_token, class_casing, ...), the pydantic
+version (it writes the schema) and the compact token setting. It holds the
+schema, and the text of the two files as they were written.
+
+Within a process, entries are kept in memory whatever the specs say, and the
+schema's Draft7Validator is compiled once for all the models built. Across
+processes, if dull_specs["metamodel_cache"]: a pickle per entry, by default in
+~/.cache/literate/metamodel_cache, or dull_specs["metamodel_cache_dir"].
+"""
+
+import hashlib
+import os
+import pickle
+import sys
+from typing import Any, Dict
+
+import pydantic
+
+from utils.util_fmk import write_text
+from utils.util_inspect import get_classes_in_module, inspect_module
+from utils.util_pydantic import COMPACT_TOKENS, gen_schema
+
+METAMODEL_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "literate", "metamodel_cache")
+
+# key -> entry, and key -> the compiled validator of the entry's schema
+metamodel_entries: Dict[str, Dict] = {}
+schema_validators: Dict[str, Any] = {}
+
+
+def metamodel_cache_dir(dull_specs: Dict) -> str:
+    return dull_specs.get("metamodel_cache_dir", METAMODEL_CACHE_DIR)
+
+
+def metamodel_key(module) -> str:
+    modules = {module.__name__} | {cls.__module__ for cls in get_classes_in_module(module)}
+
+    hasher = hashlib.sha256()
+    hasher.update(f"pydantic {pydantic.VERSION}, compact {COMPACT_TOKENS}\n".encode())
+    for module_name in sorted(modules):
+        module_path = getattr(sys.modules.get(module_name), "__file__", None)
+        if module_path and os.path.exists(module_path):
+            hasher.update(f"\n{module_name}\n".encode())
+            with open(module_path, "rb") as module_file:
+                hasher.update(module_file.read())
+    return hasher.hexdigest()
+
+
+def write_metamodel_artifacts(dull_specs: Dict, module, model_class, schema_dir: str, schema_name: str, survey_name: str) -> Dict:
+    """
+    Writes {schema_dir}/{schema_name}_schema.yaml and {schema_dir}/{survey_name},
+    made again only if there's no entry for the metamodel. Returns the entry.
+    """
+    schema_path = f"{schema_dir}/{schema_name}_schema.yaml"
+    survey_path = f"{schema_dir}/{survey_name}"
+
+    key = metamodel_key(module)
+    use_disk = dull_specs.get("metamodel_cache", False)
+    entry = metamodel_entries.get(key)
+    if entry is None and use_disk:
+        entry = load_metamodel_entry(dull_specs, key)
+
+    if entry is None:
+        schema = gen_schema(model_class, schema_name, schema_dir)
+        inspect_module(module, survey_name, schema_dir)
+        entry = {"key": key, "schema": schema, "schema_yaml": read_text(schema_path), "survey_yaml": read_text(survey_path)}
+        if use_disk:
+            store_metamodel_entry(dull_specs, key, entry)
+    else:
+        print("Metamodel unchanged - using the cached schema and survey")
+        write_text(schema_path, entry["schema_yaml"])
+        write_text(survey_path, entry["survey_yaml"])
+
+    metamodel_entries[key] = entry
+    return entry
+
+
+def metamodel_validator(entry: Dict):
+    """The Draft7Validator for the entry's schema, compiled the first time it's wanted."""
+    from jsonschema import Draft7Validator
+
+    validator = schema_validators.get(entry["key"])
+    if validator is None:
+        validator = Draft7Validator(entry["schema"])
+        schema_validators[entry["key"]] = validator
+    return validator
+
+
+def read_text(path: str) -> str:
+    with open(path, encoding="utf-8") as text_file:
+        return text_file.read()
+
+
+def load_metamodel_entry(dull_specs: Dict, key: str) -> Any:
+    entry_path = os.path.join(metamodel_cache_dir(dull_specs), f"{key}.pickle")
+    if not os.path.exists(entry_path):
+        return None
+    try:
+        with open(entry_path, "rb") as entry_file:
+            return pickle.load(entry_file)
+    except Exception as e:
+        print(f"Ignoring unreadable metamodel cache entry {entry_path}: {e}")
+        return None
+
+
+def store_metamodel_entry(dull_specs: Dict, key: str, entry: Dict):
+    cache_dir = metamodel_cache_dir(dull_specs)
+    os.makedirs(cache_dir, exist_ok=True)
+    entry_path = os.path.join(cache_dir, f"{key}.pickle")
+    temp_path = f"{entry_path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, "wb") as entry_file:
+            pickle.dump(entry, entry_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, entry_path)
+    except Exception as e:
+        print(f"Could not cache the metamodel in {entry_path}: {e}")
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
@@ -0,0 +1,207 @@
+"""
+On-disk cache of parsed models, so rebuilding an unchanged model skips
+parsing, deriving and construction altogether.
+
+An entry is keyed on
+- the model document's content (and that of any documents it includes)
+- the grammar in the dull specs: part_parts, part_plurals, listed_parts, all_clauses_by_priority
+- the source of the modules that parse with it: the parser itself, the
+  module of every class the grammar mentions (handlers, clause types, ...),
+  and any others the caller names (e.g. the module of the model's classes) -
+  along with every module of the project they use, whose classes or functions
+  end up in (or make) what's pickled: class_casing, class_pom_token, util_json, ...
+- the pydantic version and the compact token setting, which change how the
+  model's objects are laid out
+
+so an edit to any of those misses. An entry is a pickle of whatever the
+build hands in - for build_dull_dsl, the LiterateModel dict (if derived) and
+the LiterateModel built from the parse.
+
+The cache lives outside the results directory (which every build wipes):
+by default in ~/.cache/literate/parse_cache, or dull_specs["parse_cache_dir"].
+It's capped at PARSE_CACHE_MAX_BYTES; the least recently used entries go first.
+"""
+
+import hashlib
+import os
+import pickle
+import sys
+import types
+from dataclasses import fields, is_dataclass
+from typing import Any, Dict, List, Set
+
+import pydantic
+
+from dull_dsl.dull_parser import included_paths
+from utils.util_fmk import read_lines
+from utils.util_pydantic import COMPACT_TOKENS
+
+PARSE_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "literate", "parse_cache")
+PARSE_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+GRAMMAR_KEYS = ["part_parts", "part_plurals", "listed_parts", "all_clauses_by_priority"]
+PARSER_MODULES = ["dull_dsl.dull_parser", "dull_dsl.dull_parser_core", "dull_dsl.dull_parser_classes"]
+
+# modules with source files under here are the project's, and get hashed; the rest are libraries
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_cache_dir(dull_specs: Dict) -> str:
+    return dull_specs.get("parse_cache_dir", PARSE_CACHE_DIR)
+
+
+def parse_cache_key(dull_specs: Dict, model_doc_path: str, code_modules: List[str] = ()) -> str:
+    hasher = hashlib.sha256()
+    hasher.update(source_hash(model_doc_path).encode())
+    hasher.update(specs_hash(dull_specs, code_modules).encode())
+    return hasher.hexdigest()
+
+
+def source_hash(model_doc_path: str) -> str:
+    """Hash of the document, and of the documents it includes."""
+    hasher = hashlib.sha256()
+    hash_source_into(hasher, model_doc_path)
+    return hasher.hexdigest()
+
+
+def hash_source_into(hasher, model_doc_path: str):
+    with open(model_doc_path, "rb") as doc_file:
+        hasher.update(doc_file.read())
+    lines = read_lines(model_doc_path)
+    for (k, include_path) in included_paths(model_doc_path, lines).items():
+        hasher.update(f"\ninclude {k} {include_path}\n".encode())
+        if os.path.exists(include_path):
+            hash_source_into(hasher, include_path)
+
+
+def specs_hash(dull_specs: Dict, code_modules: List[str] = ()) -> str:
+    """Hash of the grammar, and of the code of the modules it depends on."""
+    modules = set(PARSER_MODULES) | set(code_modules)
+    grammar = {key: dull_specs.get(key) for key in GRAMMAR_KEYS}
+
+    hasher = hashlib.sha256()
+    hasher.update(f"pydantic {pydantic.VERSION}, compact {COMPACT_TOKENS}\n".encode())
+    hasher.update(describe(grammar, modules).encode())
+    for module_name in sorted(modules_used(modules)):
+        hasher.update(module_source(module_name))
+    return hasher.hexdigest()
+
+
+def module_source(module_name: str) -> bytes:
+    """The source of a loaded module; empty if it has none."""
+    module_path = getattr(sys.modules.get(module_name), "__file__", None)
+    if not module_path or not os.path.exists(module_path):
+        return b""
+    with open(module_path, "rb") as module_file:
+        return module_file.read()
+
+
+def modules_used(module_names: Set[str]) -> Set[str]:
+    """
+    The project modules named, and those they use - for their classes, their
+    functions or themselves - and so on.
+    """
+    used = set()
+    to_visit = list(module_names)
+    while to_visit:
+        module_name = to_visit.pop()
+        if module_name in used:
+            continue
+        module = sys.modules.get(module_name)
+        if module is None or not is_project_module(module):
+            continue
+        used.add(module_name)
+        for value in list(vars(module).values()):
+            if isinstance(value, types.ModuleType):
+                to_visit.append(value.__name__)
+            else:
+                value_module = getattr(value, "__module__", None)
+                if isinstance(value_module, str):
+                    to_visit.append(value_module)
+    return used
+
+
+def is_project_module(module) -> bool:
+    module_path = getattr(module, "__file__", None)
+    if not module_path:
+        return False
+    module_path = os.path.abspath(module_path)
+    return module_path.startswith(PROJECT_ROOT + os.sep) and "site-packages" not in module_path
+
+
+def describe(obj: Any, modules: Set[str]) -> str:
+    """
+    A description of a spec value that's the same from one run to the next
+    (unlike repr(), which can include ids). Notes the module of each class in modules.
+    """
+    if obj is None or isinstance(obj, (str, int, float, bool)):
+        return repr(obj)
+    if isinstance(obj, type):
+        modules.add(obj.__module__)
+        return f"{obj.__module__}.{obj.__qualname__}"
+    if isinstance(obj, dict):
+        return "{" + ", ".join(f"{describe(k, modules)}: {describe(v, modules)}" for (k, v) in obj.items()) + "}"
+    if isinstance(obj, (list, tuple)):
+        return "[" + ", ".join(describe(item, modules) for item in obj) + "]"
+    if isinstance(obj, (set, frozenset)):
+        return "{" + ", ".join(sorted(describe(item, modules) for item in obj)) + "}"
+
+    obj_type = type(obj)
+    modules.add(obj_type.__module__)
+    if is_dataclass(obj):
+        values = {f.name: getattr(obj, f.name, None) for f in fields(obj)}
+    elif hasattr(obj, "__dict__"):
+        values = vars(obj)
+    else:
+        # e.g. a compiled pattern: its repr is its content
+        return repr(obj) if " at 0x" not in repr(obj) else obj_type.__qualname__
+    return f"{obj_type.__qualname__}({describe(values, modules)})"
+
+
+def load_cached_parse(dull_specs: Dict, key: str) -> Any:
+    """The entry stored under key, or None."""
+    entry_path = os.path.join(parse_cache_dir(dull_specs), f"{key}.pickle")
+    if not os.path.exists(entry_path):
+        return None
+    try:
+        with open(entry_path, "rb") as entry_file:
+            entry = pickle.load(entry_file)
+    except Exception as e:
+        print(f"Ignoring unreadable parse cache entry {entry_path}: {e}")
+        return None
+    os.utime(entry_path)  # most recently used
+    return entry
+
+
+def store_cached_parse(dull_specs: Dict, key: str, entry: Any):
+    cache_dir = parse_cache_dir(dull_specs)
+    os.makedirs(cache_dir, exist_ok=True)
+    entry_path = os.path.join(cache_dir, f"{key}.pickle")
+    temp_path = f"{entry_path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, "wb") as entry_file:
+            pickle.dump(entry, entry_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, entry_path)
+    except Exception as e:
+        print(f"Could not cache the parse in {entry_path}: {e}")
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        return
+    evict_parses(cache_dir, dull_specs.get("parse_cache_max_bytes", PARSE_CACHE_MAX_BYTES))
+
+
+def evict_parses(cache_dir: str, max_bytes: int):
+    """Remove the least recently used entries until the cache fits in max_bytes."""
+    entries = []
+    for name in os.listdir(cache_dir):
+        if name.endswith(".pickle"):
+            entry_path = os.path.join(cache_dir, name)
+            stat = os.stat(entry_path)
+            entries.append((stat.st_mtime, stat.st_size, entry_path))
+
+    total = sum(size for (_, size, _) in entries)
+    for (_, size, entry_path) in sorted(entries):
+        if total <= max_bytes:
+            break
+        os.remove(entry_path)
+        total -= size
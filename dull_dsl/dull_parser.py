@@ -1,19 +1,21 @@
-from typing import List, Dict, Tuple, Callable, Any
+from typing import List, Dict, Tuple, Callable, Any, Iterator
 from abc import ABC
 import re
 
 import os
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
 from utils.util_fmk import write_text
 from utils.util_json import as_json, write_yaml
 from utils.util_fmk import create_fresh_directory
 
-from emoji import emoji_list, replace_emoji
+from utils.util_emoji import might_have_emoji, strip_emoji
 
 # from utils.util_json_pom import as_json
 # from utils.util_fmk_pom import as_yaml
 
 
-from utils.util_fmk import read_lines
+from utils.util_fmk import read_lines, iter_lines
 
 
 from dull_dsl.dull_parser_classes import (
@@ -21,43 +23,388 @@ from dull_dsl.dull_parser_classes import (
     TypedLine,
     Clause,
     ClauseLine,
+    ParserContext,
+    IncludeLine,
+    TypedLineBuffer,
+    LazyTypedLines,
+    PreviousParses,
 )
 
 
 from dull_dsl.dull_parser_core import DocPart
 
-all_clauses_by_priority = None
-part_plurals = None
-part_parts = None
+# Parts this close to the Document - the model itself, and its subjects (or loose classes) -
+# are the units for
+# - a streaming parse, which hands them out as soon as they close
+# - an incremental reparse, which reuses the ones whose lines haven't changed
+STREAMED_DEPTH = 2
 
+# A model can be split across files: this line (invisible in rendered markdown)
+# puts the lines of another document, relative to this one, at that point -
+# the parse is the same as if they'd been pasted in.
+#   <!-- include Subjects/Ordering.md -->
+INCLUDE_PATTERN = re.compile(r"<!--\s*include\s+(.+?)\s*-->$", re.IGNORECASE)
 
-def parse_model_doc(dull_specs: Dict, model_doc_path: str) -> DocPart:
+# a worker process per included file, once there are this many
+PARALLEL_INCLUDES = 2
 
-    doc_part = DocPart("Document", None)
-    current_part = doc_part
-    current_part_type = "Document"
 
-    global all_clauses_by_priority, part_plurals, part_parts
-    all_clauses_by_priority = dull_specs["all_clauses_by_priority"]
-    part_plurals = dull_specs["part_plurals"]
-    part_parts = dull_specs["part_parts"]
+def parse_model_doc(dull_specs: Dict, model_doc_path: str, processes: int = None) -> DocPart:
+    """
+    Parses a model document, along with any documents it includes.
+    With several includes, their lines are classified in worker processes (at most
+    processes of them; 0 for none) while this one classifies its own.
+    """
 
+    context = ParserContext.from_dull_specs(dull_specs)
     print(f"PARSING {model_doc_path}")
-    current_eligible_parts = part_parts.get(current_part.part_type)
 
     lines = read_lines(model_doc_path)
 
+    include_paths = included_paths(model_doc_path, lines)
+    pool = None
+    if processes != 0 and len(include_paths) >= PARALLEL_INCLUDES:
+        pool = ProcessPoolExecutor(max_workers=processes)
+    try:
+        included_docs = {}
+        for k, include_path in include_paths.items():
+            if pool:
+                included_docs[k] = pool.submit(classify_included_doc, dull_specs, include_path)
+
+        # every line is classified exactly once, up front
+        typed_lines = tokenize_lines(context, lines)
+
+        # results are placed by line number, whichever worker finishes first
+        for k, include_path in include_paths.items():
+            if pool:
+                included_docs[k] = included_docs[k].result()
+            else:
+                included_docs[k] = classify_included_doc(dull_specs, include_path)
+    finally:
+        if pool:
+            pool.shutdown()
+    (lines, typed_lines) = splice_includes(lines, typed_lines, included_docs)
+
+    typed_lines = TypedLineBuffer(typed_lines)
+
+    doc_part = DocPart("Document", None)
+    for closed_part in group_typed_lines(context, doc_part, typed_lines):
+        pass  # the whole tree stays under doc_part
+    hash_parts(doc_part, [line.strip() for line in lines])
+    return doc_part
+
+
+def reparse_model_doc(dull_specs: Dict, model_doc_path: str, previous: DocPart) -> DocPart:
+    """
+    Parses the document again, splicing in the top level parts of a previous parse
+    (with their derived dicts) wherever their lines are unchanged.
+    Only the lines of new or edited parts are classified.
+
+    The previous tree gives up the parts that are reused, so don't use it afterwards.
+    """
+    lines = read_lines(model_doc_path)
+    if included_paths(model_doc_path, lines):
+        # edits to the included files wouldn't show in this file's hashes
+        return parse_model_doc(dull_specs, model_doc_path)
+
+    context = ParserContext.from_dull_specs(dull_specs)
+    print(f"REPARSING {model_doc_path}")
+    stripped_lines = [line.strip() for line in lines]
+    typed_lines = LazyTypedLines(lines, lambda line: assess_line(context, line))
+    reusable = reusable_parts(previous)
+
+    doc_part = DocPart("Document", None)
+    for closed_part in group_typed_lines(
+        context, doc_part, typed_lines, reusable=reusable, stripped_lines=stripped_lines
+    ):
+        pass
+    hash_parts(doc_part, stripped_lines)
+    print(f"..classified {typed_lines.assessed()} of {len(lines)} lines")
+    return doc_part
+
+
+def parse_model_doc_incrementally(
+    dull_specs: Dict, model_doc_path: str, previous_parses: PreviousParses
+) -> DocPart:
+    """parse_model_doc(), reusing what it can from the last parse of the same document in previous_parses."""
+    previous = previous_parses.take(model_doc_path)
+    if previous is None:
+        doc_part = parse_model_doc(dull_specs, model_doc_path)
+    else:
+        doc_part = reparse_model_doc(dull_specs, model_doc_path, previous)
+    previous_parses.keep(model_doc_path, doc_part)
+    return doc_part
+
+
+def stream_model_doc(
+    dull_specs: Dict, model_doc_path: str, streamed_depth: int = STREAMED_DEPTH
+) -> Iterator[DocPart]:
+    """
+    Parses a model document while reading it, yielding each top level part
+    (see STREAMED_DEPTH) as soon as it is complete - children before their parents.
+    The Document itself comes last.
+
+    Lines are read and classified only as the parse reaches them, and dropped once
+    a part is handed out; a consumer that releases the parts it gets, and keeps
+    nothing bigger than the model's objects (see derive_model_streaming), keeps
+    memory bounded by those and the largest subject.
+    """
+    context = ParserContext.from_dull_specs(dull_specs)
+    print(f"PARSING (streaming) {model_doc_path}")
+
+    def with_includes(doc_path: str) -> Iterator[TypedLine]:
+        # an include gives way to the lines of its document, read as lazily
+        for line in iter_lines(doc_path):
+            typed_line = assess_line(context, line)
+            if not isinstance(typed_line, IncludeLine):
+                yield typed_line
+                continue
+            include_path = os.path.join(os.path.dirname(doc_path), typed_line.content)
+            if os.path.exists(include_path):
+                yield from with_includes(include_path)
+            else:
+                print(f"ERROR: included document not found: {include_path}")
+
+    typed_lines = TypedLineBuffer(with_includes(model_doc_path))
+
+    doc_part = DocPart("Document", None)
+    yield from group_typed_lines(context, doc_part, typed_lines, streamed_depth)
+
+
+def derive_dict_streaming(dull_specs: Dict, model_doc_path: str) -> Tuple[DocPart, Dict]:
+    """
+    Streaming equivalent of parse_model_doc() + derive_dict_for_document().
+
+    Only the DocPart tree is streamed: each part's lines are dropped once its
+    dict is derived, but the dicts are all kept, for the whole document's dict.
+    So peak memory still grows with that dict. The build uses this only when it
+    writes the dict out; otherwise, derive_model_streaming().
+    """
+    doc_part = None
+    for part in stream_model_doc(dull_specs, model_doc_path):
+        if part.parent_part is None:
+            doc_part = part
+            break
+        part.derive_and_release(dull_specs)
+    return (doc_part, doc_part.derive_dict_for_document(dull_specs))
+
+
+def derive_model_streaming(dull_specs: Dict, model_doc_path: str) -> Any:
+    """
+    Streaming equivalent of parse_model_doc(), then derive_object_for_document() on
+    the first LiterateModel part - with no dicts kept. Each part of that model has
+    its objects built as it closes and its lines dropped, and its parent takes the
+    objects as they are; so peak memory is the model's objects and the lines of the
+    largest subject. The other parts of the document have their dicts derived (and
+    dropped), as parse_to_model does for the rest of the document, so errors there
+    are the same, streamed or not.
+    Returns the model, or None if there isn't one.
+    """
+    model_part = None
+    for part in stream_model_doc(dull_specs, model_doc_path):
+        if part.parent_part is None:
+            break
+        owner = part if part.part_type == "LiterateModel" else part.parent_part
+        if model_part is None and owner.part_type == "LiterateModel":
+            model_part = owner
+        if owner is model_part:
+            part.derive_object_and_release(dull_specs)
+        else:
+            part.derive_dict_for_document(dull_specs)
+            part.detach()
+    return model_part.derived_object if model_part is not None else None
+
+
+def stream_part_dicts(dull_specs: Dict, model_doc_path: str) -> Iterator[Tuple[DocPart, Dict]]:
+    """
+    Yields (part, its dict) for each part stream_model_doc() hands out - the
+    subjects, then the model, then the Document - and keeps neither: once
+    derived, a part is detached from the tree, so a parent's dict leaves out
+    the sub parts already yielded. A consumer that writes each dict out (or
+    folds it into something smaller) keeps memory bounded by the largest subject.
+    """
+    for part in stream_model_doc(dull_specs, model_doc_path):
+        part_dict = part.derive_dict_for_document(dull_specs)
+        part.detach()
+        yield (part, part_dict)
+
+
+def included_paths(model_doc_path: str, lines: List[str]) -> Dict[int, str]:
+    """Paths of the included documents, by line number of the include."""
+    doc_dir = os.path.dirname(model_doc_path)
+    include_paths = {}
+    for k, line in enumerate(lines):
+        include_match = INCLUDE_PATTERN.match(line.strip())
+        if include_match:
+            include_paths[k] = os.path.join(doc_dir, include_match.group(1))
+    return include_paths
+
+
+def classify_included_doc(dull_specs: Dict, include_path: str) -> Tuple[List[str], List[TypedLine]]:
+    """
+    The lines of an included document, and their TypedLines, with its own
+    includes spliced in. Runs in a worker process, so includes within includes
+    are done serially.
+    """
+    if not os.path.exists(include_path):
+        print(f"ERROR: included document not found: {include_path}")
+        return ([], [])
+    context = ParserContext.from_dull_specs(dull_specs)
+    print(f"CLASSIFYING {include_path}")
+    lines = read_lines(include_path)
+    typed_lines = tokenize_lines(context, lines)
+    included_docs = {
+        k: classify_included_doc(dull_specs, path) for (k, path) in included_paths(include_path, lines).items()
+    }
+    return splice_includes(lines, typed_lines, included_docs)
+
+
+def splice_includes(
+    lines: List[str], typed_lines: List[TypedLine], included_docs: Dict[int, Tuple[List[str], List[TypedLine]]]
+) -> Tuple[List[str], List[TypedLine]]:
+    """The lines with each include line (by number) replaced by those of its document."""
+    if not included_docs:
+        return (lines, typed_lines)
+    spliced_lines = []
+    spliced_typed_lines = []
+    for k, (line, typed_line) in enumerate(zip(lines, typed_lines)):
+        if k in included_docs:
+            (included_lines, included_typed_lines) = included_docs[k]
+            spliced_lines.extend(included_lines)
+            spliced_typed_lines.extend(included_typed_lines)
+        else:
+            spliced_lines.append(line)
+            spliced_typed_lines.append(typed_line)
+    return (spliced_lines, spliced_typed_lines)
+
+
+def part_depth(part: DocPart) -> int:
+    depth = 0
+    while part.parent_part:
+        depth += 1
+        part = part.parent_part
+    return depth
+
+
+def part_context(part: DocPart) -> Tuple[str]:
+    """Part types from the Document down to part."""
+    context = []
+    while part:
+        context.append(part.part_type)
+        part = part.parent_part
+    return tuple(reversed(context))
+
+
+def span_hash(stripped_lines: List[str], first_line: int, end_line: int) -> str:
+    text = "\n".join(stripped_lines[first_line:end_line])
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def hash_parts(doc_part: DocPart, stripped_lines: List[str], depth: int = STREAMED_DEPTH):
+    """Content hashes for the parts down to depth, over their line spans."""
+    if not doc_part.content_hash:  # reused and included parts come with theirs
+        doc_part.content_hash = span_hash(stripped_lines, doc_part.first_line, doc_part.end_line)
+    if depth == 0:
+        return
+    for item in doc_part.items:
+        if isinstance(item, DocPart):
+            hash_parts(item, stripped_lines, depth - 1)
+
+
+def reusable_parts(previous: DocPart, depth: int = STREAMED_DEPTH) -> Dict[Tuple, List[DocPart]]:
+    """
+    The parts of a previous parse that a reparse may splice back in, keyed by
+    (context of the parent, part type, header line).
+    """
+    reusable = {}
+
+    def gather(part: DocPart, depth: int):
+        for item in part.items:
+            if not isinstance(item, DocPart):
+                continue
+            if item.content_hash and item.closed_by is not None:
+                header = item.items[0].content if item.items else ""
+                key = (part_context(part), item.part_type, header)
+                reusable.setdefault(key, []).append(item)
+            if depth > 1:
+                gather(item, depth - 1)
+
+    gather(previous, depth)
+    return reusable
+
+
+def find_reusable_part(
+    reusable: Dict, stripped_lines: List[str], typed_lines, parent: DocPart,
+    part_type: str, line_k: int,
+) -> DocPart:
+    """
+    A previous part that parses the same as the one starting at line_k would:
+    same context, same lines, and closed by the same kind of line.
+    """
+    key = (part_context(parent), part_type, stripped_lines[line_k])
+    for candidate in reusable.get(key, []):
+        end_k = line_k + candidate.end_line - candidate.first_line
+        if end_k > len(stripped_lines):
+            continue
+        if span_hash(stripped_lines, line_k, end_k) != candidate.content_hash:
+            continue
+        closed_by = ""  # end of file
+        if typed_lines.has(end_k):
+            line_Type = typed_lines[end_k].line_Type
+            if not isinstance(line_Type, PartStarter):
+                continue  # the part would have run on
+            closed_by = line_Type.class_started
+        if closed_by != candidate.closed_by:
+            continue
+        return candidate
+    return None
+
+
+def splice_part(part: DocPart, parent: DocPart, first_line: int):
+    """Moves a part from a previous parse into parent, starting at first_line."""
+    shift = first_line - part.first_line
+    part.parent_part = parent
+    parent.add_doc_part(part)
+
+    def shift_spans(part: DocPart):
+        part.first_line += shift
+        part.end_line += shift
+        for item in part.items:
+            if isinstance(item, DocPart):
+                shift_spans(item)
+
+    shift_spans(part)
+
+
+def group_typed_lines(
+    context: ParserContext,
+    doc_part: DocPart, typed_lines: TypedLineBuffer, streamed_depth: int = STREAMED_DEPTH,
+    reusable: Dict = None, stripped_lines: List[str] = None,
+) -> Iterator[DocPart]:
+    """
+    Groups the typed lines into parts under doc_part, noting each part's line span.
+    Yields each part at streamed_depth or above when it closes, and doc_part at the end.
+
+    With reusable parts from a previous parse (and the stripped source lines to compare
+    against), an unchanged part is spliced in instead of being parsed again.
+
+    Text still open at the end is dropped. Includes are already spliced into the lines.
+    """
+    doc_part.first_line = 0
+    current_part = doc_part
+    current_part_type = doc_part.part_type
+
     # note. Looping through all lines, but
     # will have inner loops to collect text paras and blocks;
     # those inner loops will alter k
     open_elaboration = []
     open_paragraph = []
     next_k = 0
-    while next_k < len(lines):
-        line = lines[next_k]
+    while typed_lines.has(next_k):
+        line_k = next_k
+        typed_line = typed_lines[next_k]
         next_k += 1
 
-        typed_line = assess_line(line)
         type_label = typed_line.type_label
         line_Type = typed_line.line_Type  # the object for the LineType
 
@@ -93,7 +440,7 @@ def parse_model_doc(dull_specs: Dict, model_doc_path: str) -> DocPart:
             # print(f"Starting code bock - for label {type_label}")
 
             # note: next_k has already been incremented at the top of the loop
-            (next_k, extra_text) = consume_through("CODE_FENCE", lines, next_k)
+            (next_k, extra_text) = consume_through("CODE_FENCE", typed_lines, next_k)
             # if extra_text:
             # print("FOUND CODE BLOCK:", extra_text)
             typed_line.extra_text = extra_text
@@ -121,7 +468,7 @@ def parse_model_doc(dull_specs: Dict, model_doc_path: str) -> DocPart:
             open_paragraph = []  # reset the paragraph
             open_elaboration = []
         # for all clauses and headers, except text and blanks, gather addiional text
-        (next_k, extra_text) = consume_while("TEXT_LINE", lines, next_k)
+        (next_k, extra_text) = consume_while("TEXT_LINE", typed_lines, next_k)
         if extra_text:
             typed_line.extra_text = extra_text
             # print("FOUND EXTRA TEXT")
@@ -138,84 +485,112 @@ def parse_model_doc(dull_specs: Dict, model_doc_path: str) -> DocPart:
 
         if part_type:  # i.e not just text or a minor clause
             # print(f"Found new part: {part_type}")
-            while part_type not in current_eligible_parts:
-                # print(f"..But {part_type} not eligible for {current_part_type}")
-                parent_part = current_part.parent_part
-                if not parent_part:  # doesn't seem to belong anywere
-                    # print(f"..But {line_type} doesn't belong anywhere; placing in Document")
-                    break
-                current_part = parent_part
-                current_part_type = parent_part.part_type
-                current_eligible_parts = part_parts.get(current_part_type, [])
+            current_part = yield from close_parts_for(
+                context, part_type, current_part, line_k, typed_lines, next_k, streamed_depth
+            )
+            current_part_type = current_part.part_type
             # print(
             #     f"... {part_type} does fit into {current_part_type}; creating subpart"
             # )
+            if reusable and part_depth(current_part) < streamed_depth:
+                reused_part = find_reusable_part(
+                    reusable, stripped_lines, typed_lines, current_part, part_type, line_k
+                )
+                if reused_part:
+                    splice_part(reused_part, current_part, line_k)
+                    next_k = reused_part.end_line  # ... and the current part stays put
+                    yield reused_part
+                    continue
             new_part = create_doc_part(part_type, current_part)
+            new_part.first_line = line_k
             current_part = new_part
             current_part_type = part_type
-            current_eligible_parts = part_parts.get(part_type, [])
             ## .. and then put the line into the new current part
         current_part.add_line(typed_line)  # for text-lines and blank-lines
         if typed_line.type_label in ["TEXT_LINE", "PARAGRAPH", "ELABORATION"]:
             current_part.add_line(typed_line)
             # print(f"Directly Added {typed_line} to {current_part_type}")
-    return doc_part
-    # displayed = doc_part.displayed()
-    # return displayed
+
+    # end of document closes whatever is still open
+    while current_part.parent_part:
+        current_part.end_line = next_k
+        current_part.closed_by = ""
+        if part_depth(current_part) <= streamed_depth:
+            yield current_part
+        current_part = current_part.parent_part
+    doc_part.end_line = next_k
+    yield doc_part
+
+
+def tokenize_lines(context: ParserContext, lines: List[str]) -> List[TypedLine]:
+    """Classify each source line once; the parse loop works on the result."""
+    return [assess_line(context, line) for line in lines]
 
 
 def consume_until(
-    final_label: str, lines: List[str], next_k: int
+    final_label: str, typed_lines: TypedLineBuffer, next_k: int
 ) -> Tuple[int, List[str]]:
-    extra_text = []
-    while next_k < len(lines):
-        line = lines[next_k]
-        typed_line = assess_line(line)
-        type_label = typed_line.type_label
-        # print("Consumed through  {final_label}: ", typed_line)
-        extra_text.append(typed_line.content)
-        next_k += 1  # i.e. consumed the end marker
+    end_k = next_k
+    while typed_lines.has(end_k):
+        type_label = typed_lines[end_k].type_label
+        end_k += 1  # i.e. consumed the end marker
 
         if type_label == final_label:  # time to wrap the code block
             break
-    return (next_k, extra_text)
+    extra_text = [t.content for t in typed_lines[next_k:end_k]]
+    return (end_k, extra_text)
 
 
 def consume_through(
-    final_label: str, lines: List[str], next_k: int
+    final_label: str, typed_lines: TypedLineBuffer, next_k: int
 ) -> Tuple[int, List[str]]:
-    extra_text = []
-    first = True
-    while next_k < len(lines):
-        line = lines[next_k]
-        typed_line = assess_line(line)
-        type_label = typed_line.type_label
-        # print(f"Consumed through  {final_label}: ", typed_line)
-        extra_text.append(typed_line.content)
-        next_k += 1  # i.e. consumed the end marker
+    end_k = next_k
+    while typed_lines.has(end_k):
+        type_label = typed_lines[end_k].type_label
+        end_k += 1  # i.e. consumed the end marker
 
+        first = end_k == next_k + 1
         if not first and type_label == final_label:  # time to wrap the code block
             break
-        first = False
-        # print(f"{type_label} != {final_label}. continuing")
-    return (next_k, extra_text)
+    extra_text = [t.content for t in typed_lines[next_k:end_k]]
+    return (end_k, extra_text)
 
 
 def consume_while(
-    final_label: str, lines: List[str], next_k: int
+    final_label: str, typed_lines: TypedLineBuffer, next_k: int
 ) -> Tuple[int, List[str]]:
-    extra_text = []
-    while next_k < len(lines):
-        next_line = lines[next_k]
-        typed_next_line = assess_line(next_line)
-        next_line_label = typed_next_line.type_label
-        if next_line_label != final_label:
-            break
+    end_k = next_k
+    while typed_lines.has(end_k) and typed_lines[end_k].type_label == final_label:
         # so. text just after the minor clause.
         # gather it up
-        extra_text.append(typed_next_line.content)
-        next_k += 1
-    return (next_k, extra_text)
+        end_k += 1
+    extra_text = [t.content for t in typed_lines[next_k:end_k]]
+    return (end_k, extra_text)
+
+
+def close_parts_for(
+    context: ParserContext,
+    part_type: str, current_part: DocPart, line_k: int, typed_lines: TypedLineBuffer,
+    next_k: int, streamed_depth: int,
+) -> Iterator[DocPart]:
+    """
+    Closes open parts, innermost first, until one can hold a part_type part (or the
+    Document is reached). Yields the closed top level parts; returns the part that's left open.
+    """
+    while part_type not in context.parts_for(current_part.part_type):
+        # print(f"..But {part_type} not eligible for {current_part.part_type}")
+        parent_part = current_part.parent_part
+        if not parent_part:  # doesn't seem to belong anywere
+            # print(f"..But {line_type} doesn't belong anywhere; placing in Document")
+            break
+        closed_part = current_part
+        closed_part.end_line = line_k
+        closed_part.closed_by = part_type
+        current_part = parent_part
+        if part_depth(closed_part) <= streamed_depth:
+            typed_lines.release(next_k)
+            yield closed_part
+    return current_part
 
 
 def create_doc_part(line_type, parent_part) -> DocPart:
@@ -225,31 +600,35 @@ def create_doc_part(line_type, parent_part) -> DocPart:
     return chunk
 
 
-def assess_line(line: str) -> TypedLine:
+def assess_line(context: ParserContext, line: str) -> TypedLine:
     trimmed = line.strip()
     if trimmed == "":
         return TypedLine("BLANK_LINE", None, trimmed)
 
     # get rid of underscores used for italics
 
+    if trimmed.startswith("<!--"):
+        include_match = INCLUDE_PATTERN.match(trimmed)
+        if include_match:
+            return IncludeLine("INCLUDE", None, include_match.group(1))
+
     trimmed_bare = trimmed  # will be line wo emojis
-    emojis = emoji_list(trimmed)
-    if emojis:
-        # print(f"found EMOJIS {emojis}: {trimmed}")
-        trimmed_bare = replace_emoji(trimmed, "").strip()
-
-    # for lineType in all_line_types:
-    for lineType in all_clauses_by_priority:
-        if lineType.matches(trimmed_bare):
-            # print(f"found a {lineType} line")
-
-            # but put the line with original emojis into the result
-            # TODO. retreated to bare until emojis work ok
-            # typed_line = ClauseLine(lineType.line_label, lineType, trimmed_bare)
-            typed_line = ClauseLine(lineType.line_label, lineType, trimmed)
-
-            # print(f"assess() returning {repr(typed_line)}")
-            return typed_line
+    if might_have_emoji(trimmed):  # plain text lines skip the emoji package
+        # print(f"found EMOJIS: {trimmed}")
+        trimmed_bare = strip_emoji(trimmed)
+
+    # same result as the first match in all_clauses_by_priority
+    lineType = context.line_classifier.classify(trimmed_bare)
+    if lineType:
+        # print(f"found a {lineType} line")
+
+        # but put the line with original emojis into the result
+        # TODO. retreated to bare until emojis work ok
+        # typed_line = ClauseLine(lineType.line_label, lineType, trimmed_bare)
+        typed_line = ClauseLine(lineType.line_label, lineType, trimmed)
+
+        # print(f"assess() returning {repr(typed_line)}")
+        return typed_line
 
     if trimmed.startswith("```"):
         return TypedLine("CODE_FENCE", None, trimmed)
@@ -1,7 +1,9 @@
 import re
+import collections
 from dataclasses import dataclass, field
+from types import MappingProxyType
 from abc import ABC
-from typing import Any, List, Dict, Tuple, Callable, Optional
+from typing import Any, List, Dict, Tuple, Callable, Optional, Iterable, Mapping, FrozenSet
 from ldm.ldm_parse_fns import (
     ParseHandler,
     ParseName,
@@ -142,6 +144,143 @@ class MinorClause(Clause):
     pass  # All initialization happens in parent classes
 
 
+class LineClassifier:
+    """
+    Compiled recognizer for a list of LineTypes, given in priority order.
+    - HeadLines are looked up in a table keyed on the first character of the line
+    - Clauses are matched with one alternation of all their kw_patterns
+    - any other LineType falls back to its own matches()
+
+    classify() returns the same LineType that a linear scan of the list would.
+    """
+
+    def __init__(self, line_types: List[LineType]):
+        self.source = line_types
+        self.line_types = []  # distinct specs, in priority order
+        self.heads_by_char = {}  # first char -> [(rank, HeadLine)]
+        self.heads_for_any = []  # headlines with an empty starter_pattern
+        self.others = []  # [(rank, LineType)] - matched one by one
+        self.clause_ranks = {}  # group name in clause_regex -> rank
+
+        clause_patterns = []
+        seen = set()
+        for line_type in line_types:
+            if isinstance(line_type, HeadLine):
+                key = ("head", line_type.starter_pattern)
+            elif isinstance(line_type, Clause):
+                key = ("clause", line_type.kw_pattern)
+            else:
+                key = ("other", id(line_type))
+            # a spec with the same recognizer earlier in the list always wins
+            if key in seen:
+                continue
+            seen.add(key)
+
+            rank = len(self.line_types)
+            self.line_types.append(line_type)
+
+            if isinstance(line_type, HeadLine):
+                self.add_head(rank, line_type)
+            elif isinstance(line_type, Clause):
+                group = f"c{rank}"
+                self.clause_ranks[group] = rank
+                clause_patterns.append(f"(?P<{group}>{line_type.kw_pattern})")
+            else:
+                self.others.append((rank, line_type))
+
+        self.first_clause_rank = min(self.clause_ranks.values(), default=len(self.line_types))
+        self.clause_regex = None
+        if clause_patterns:
+            # alternatives are tried left to right, so the first (highest priority)
+            # clause that matches is the one reported by lastgroup
+            self.clause_regex = re.compile("|".join(clause_patterns), re.IGNORECASE)
+
+    def add_head(self, rank: int, head: HeadLine):
+        starter = head.starter_pattern
+        if not starter:
+            self.heads_for_any.append((rank, head))
+            for heads in self.heads_by_char.values():
+                heads.append((rank, head))
+            return
+        first_char = starter[0]
+        if first_char not in self.heads_by_char:
+            self.heads_by_char[first_char] = list(self.heads_for_any)
+        self.heads_by_char[first_char].append((rank, head))
+
+    def classify(self, trimmed: str) -> Optional[LineType]:
+        best = len(self.line_types)
+
+        heads = self.heads_for_any
+        if trimmed:
+            heads = self.heads_by_char.get(trimmed[0], self.heads_for_any)
+        for rank, head in heads:
+            if trimmed.startswith(head.starter_pattern):
+                best = rank
+                break
+
+        if self.clause_regex and best > self.first_clause_rank:
+            match = self.clause_regex.match(trimmed)
+            if match:
+                best = min(best, self.clause_ranks[match.lastgroup])
+
+        for rank, other in self.others:
+            if rank >= best:
+                break
+            if other.matches(trimmed):
+                best = rank
+                break
+
+        if best < len(self.line_types):
+            return self.line_types[best]
+        return None
+
+
+_line_classifiers = {}
+
+
+def line_classifier_for(line_types: List[LineType]) -> LineClassifier:
+    """Returns the LineClassifier for a list of clause specs, compiling it on first use."""
+    classifier = _line_classifiers.get(id(line_types), None)
+    if classifier is None or classifier.source is not line_types:
+        classifier = LineClassifier(line_types)
+        _line_classifiers[id(line_types)] = classifier
+    return classifier
+
+
+@dataclass(frozen=True)
+class ParserContext:
+    """
+    What a parse - and the dict derived from it - needs from the dull_specs,
+    fixed for the length of the parse.
+    It's passed along explicitly rather than kept in module globals, so parses of
+    different models can overlap (threads, a long-lived server) without
+    stepping on each other.
+    """
+
+    all_clauses_by_priority: Tuple[LineType, ...]
+    part_parts: Mapping[str, Tuple[str, ...]]  # part type -> part types it can hold
+    part_plurals: Mapping[str, str]
+    listed_parts: FrozenSet[str]
+    line_classifier: LineClassifier
+
+    @classmethod
+    def from_dull_specs(cls, dull_specs: Dict) -> "ParserContext":
+        all_clauses_by_priority = dull_specs["all_clauses_by_priority"]
+        part_parts = {
+            part_type: tuple(parts) for part_type, parts in dull_specs["part_parts"].items()
+        }
+        return cls(
+            all_clauses_by_priority=tuple(all_clauses_by_priority),
+            part_parts=MappingProxyType(part_parts),
+            part_plurals=MappingProxyType(dict(dull_specs["part_plurals"])),
+            listed_parts=frozenset(dull_specs.get("listed_parts", [])),
+            line_classifier=line_classifier_for(all_clauses_by_priority),
+        )
+
+    def parts_for(self, part_type: str) -> Tuple[str, ...]:
+        return self.part_parts.get(part_type, ())
+
+
 ### Run time objects
 
 
@@ -170,6 +309,15 @@ class TypedLine:
         indent = "_ " * level
         return f"{indent}{self}\n"
 
+    def write_display(self, out, level):
+        out.write(self.displayed(level))
+
+
+@dataclass
+class IncludeLine(TypedLine):
+    # content is the path of the included document; the parser splices its lines in place of this one
+    pass
+
 
 class ClauseLine(TypedLine):
     line_Type: Clause
@@ -220,6 +368,96 @@ class ClauseLine(TypedLine):
         return the_dict
 
 
+class TypedLineBuffer:
+    """
+    The TypedLines of a document, addressed by line number.
+    - typed_lines can be a list or a lazy iterator; it is only pulled as far as the parser looks
+    - release(k) forgets the lines before k, once the parser is past them for good
+
+    So a streaming parse holds on to the open part of the document, not all of it.
+    """
+
+    def __init__(self, typed_lines: Iterable[TypedLine]):
+        self.source = iter(typed_lines)
+        self.lines: List[TypedLine] = []
+        self.offset = 0  # line number of lines[0]
+        self.exhausted = False
+
+    def has(self, k: int) -> bool:
+        while k - self.offset >= len(self.lines):
+            if self.exhausted:
+                return False
+            typed_line = next(self.source, None)
+            if typed_line is None:
+                self.exhausted = True
+                return False
+            self.lines.append(typed_line)
+        return True
+
+    def __getitem__(self, k):
+        if isinstance(k, slice):
+            return self.lines[k.start - self.offset : k.stop - self.offset]
+        return self.lines[k - self.offset]
+
+    def release(self, k: int):
+        if k > self.offset:
+            del self.lines[: k - self.offset]
+            self.offset = k
+
+
+class LazyTypedLines:
+    """
+    Same interface as TypedLineBuffer, over source lines already in memory.
+    A line is only classified (by assess) when the parser looks at it, so the lines
+    of parts that an incremental reparse reuses are never classified at all.
+    """
+
+    def __init__(self, lines: List[str], assess: Callable[[str], TypedLine]):
+        self.source = lines
+        self.assess = assess
+        self.typed_lines: Dict[int, TypedLine] = {}
+
+    def has(self, k: int) -> bool:
+        return k < len(self.source)
+
+    def __getitem__(self, k):
+        if isinstance(k, slice):
+            return [self[i] for i in range(k.start, k.stop)]
+        typed_line = self.typed_lines.get(k, None)
+        if typed_line is None:
+            typed_line = self.assess(self.source[k])
+            self.typed_lines[k] = typed_line
+        return typed_line
+
+    def release(self, k: int):
+        pass
+
+    def assessed(self) -> int:
+        return len(self.typed_lines)
+
+
+class PreviousParses:
+    """
+    The last parse of each of a few documents, for parse_model_doc_incrementally().
+    Whoever rebuilds as the model is edited makes one and passes it in each time;
+    at most max_documents are kept, the least recently parsed dropped first.
+    """
+
+    def __init__(self, max_documents: int = 4):
+        self.max_documents = max_documents
+        self.parses: "collections.OrderedDict[str, Any]" = collections.OrderedDict()
+
+    def take(self, model_doc_path: str) -> Optional[Any]:
+        """The last parse of the document, which is no longer kept: a reparse takes parts from it."""
+        return self.parses.pop(model_doc_path, None)
+
+    def keep(self, model_doc_path: str, doc_part: Any):
+        self.parses[model_doc_path] = doc_part
+        self.parses.move_to_end(model_doc_path)
+        while len(self.parses) > self.max_documents:
+            self.parses.popitem(last=False)
+
+
 def print_messages(messages: List[str]):
     print("Messages...")
     for message in messages:
@@ -1,18 +1,22 @@
 # import re
+import io
 from dataclasses import dataclass, field
 
 # from typing import Any, List, Dict, Tuple, Union, Callable, Optional
 from typing import Any, List, Dict, Union
-from emoji import emoji_list, replace_emoji
+from utils.util_emoji import emoji_list, strip_emoji
 
 # from ldm_parse_bits import parse_header
 # from utils.util_fmk_pom import as_yaml
-from utils.util_json import as_json, clean_dict
+from utils.util_json import as_json, clean_dict, tidy_dict
+from utils.util_pydantic import TYPE_REGISTRY
+from utils.typed_dict_tools_diff import object_from_typed_dict
 from utils.util_flogging import flogger, trace_method, trace_decorator
 from dull_dsl.dull_parser_classes import (
     TypedLine,
     ClauseLine,
     MajorClause,
+    ParserContext,
     # ParseHandler,
     # print_messages,
 )
@@ -21,12 +25,6 @@ from utils.class_casing import LowerCamel, SnakeCase, UpperCamel
 from ldm.Literate_01 import ClassName, AttributeName, OneLiner, Label, Emoji
 
 
-all_clauses_by_priority = None
-part_plurals = None
-part_parts = None
-listed_parts = None
-
-
 @dataclass
 class DocPart:
     part_type: str
@@ -34,11 +32,25 @@ class DocPart:
     saved_dull_specs: Dict = None
 
     items: List[Union[TypedLine, "DocPart", str]] = field(default_factory=list)
+    derived_dict: Dict = None  # parts don't change once parsed, so derive once
+    derived_object: Any = None  # a streamed part's objects, once built (derive_object_and_release)
+
+    # where the part came from, for an incremental reparse
+    first_line: int = 0
+    end_line: int = 0  # exclusive
+    closed_by: str = None  # part type of the line that ended the part; "" for end of file
+    content_hash: str = ""
 
     def __init__(self, part_type: str, parent_part: "DocPart" = None):
         self.part_type = part_type
         self.parent_part = parent_part
         self.items = []
+        self.derived_dict = None
+        self.derived_object = None
+        self.first_line = 0
+        self.end_line = 0
+        self.closed_by = None
+        self.content_hash = ""
 
     def add_line(self, typed_line: TypedLine):
         # print(f"Adding line to a {self.part_type} Part")
@@ -54,28 +66,131 @@ class DocPart:
         print(displayed)
 
     def displayed(self, level: int = 0) -> str:
-        displayed = ""
+        out = io.StringIO()
+        self.write_display(out, level)
+        return out.getvalue()
+
+    def write_display(self, out, level: int = 0):
+        """Writes displayed() to out (a text file) as it goes, rather than building the string."""
         indent = ". " * level
-        displayed += f"{indent}{self.part_type} - {self.__class__} \n"
+        out.write(f"{indent}{self.part_type} - {self.__class__} \n")
         level = level + 1
-        indent = ". " * level
 
         for item in self.items:
-            displayed += item.displayed(level)
-        return displayed
+            item.write_display(out, level)
 
     def derive_dict_for_document(self, dull_specs: Dict):
 
         self.saved_dull_specs = dull_specs
-        global all_clauses_by_priority, part_plurals, part_parts, listed_parts
-        all_clauses_by_priority = dull_specs["all_clauses_by_priority"]
-        part_plurals = dull_specs["part_plurals"]
-        part_parts = dull_specs["part_parts"]
-        listed_parts = dull_specs["listed_parts"]
+        context = ParserContext.from_dull_specs(dull_specs)
 
-        return self.derive_dict_for_part(0)
+        return self.derive_dict_for_part(context, 0)
 
-    def derive_dict_for_part(self, level: int = 0) -> Dict:
+    def derive_and_release(self, dull_specs: Dict) -> Dict:
+        """
+        For a finished part handed out by stream_model_doc: derive its dict
+        now and drop the items, so the part only keeps the dict.
+        A later derive_dict_for_document() on the whole tree picks the dict up as is.
+        """
+        derived_dict = self.derive_dict_for_document(dull_specs)
+        self.items = []
+        return derived_dict
+
+    def derive_object_and_release(self, dull_specs: Dict):
+        """
+        For a finished part handed out by stream_model_doc: build its objects
+        now and drop the items, so the part only keeps the objects - which its
+        parent takes as they are when it's built. No dict is derived.
+        """
+        context = ParserContext.from_dull_specs(dull_specs)
+        self.derived_object = self.derive_object_for_part(context, 0)
+        self.items = []
+        return self.derived_object
+
+    def detach(self):
+        """
+        For a finished part whose dict has been handed on (stream_part_dicts):
+        drops it from its parent - whose dict then leaves it out - and drops
+        its items and dict, so nothing of it is kept.
+        """
+        parent = self.parent_part
+        if parent is not None:
+            for k, item in enumerate(parent.items):
+                if item is self:
+                    del parent.items[k]
+                    break
+        self.items = []
+        self.derived_dict = None
+
+    def derive_object_for_document(self, dull_specs: Dict):
+        """
+        Build the part's objects straight from the parse, skipping the
+        dict that derive_dict_for_document() makes (and its tidy and
+        from_typed_dict() passes). For this part, gives the same objects as
+            object_from_typed_dict(tidy_dict(part.derive_dict_for_document(dull_specs)))
+        Only this part is derived: what else is in the document, and whatever
+        errors deriving it would raise, is left alone.
+        """
+        self.saved_dull_specs = dull_specs
+        context = ParserContext.from_dull_specs(dull_specs)
+
+        return self.derive_object_for_part(context, 0)
+
+    def derive_dict_for_part(self, context: ParserContext, level: int = 0) -> Dict:
+        if self.derived_dict is not None:
+            return self.derived_dict
+
+        part_dicts = set()  # ids of the dicts derived for sub parts - already clean
+
+        def derive_sub_part(part: "DocPart") -> Dict:
+            part_dict = part.derive_dict_for_part(context, level)
+            part_dicts.add(id(part_dict))
+            return part_dict
+
+        the_dict = self.gather_values(context, level, derive_sub_part)
+
+        # only this part's own values get cleaned; the sub parts' dicts are taken as they are
+        self.derived_dict = clean_dict(the_dict, settled=part_dicts)
+        return self.derived_dict
+
+    def derive_object_for_part(self, context: ParserContext, level: int = 0):
+        if self.derived_object is not None:
+            return self.derived_object
+        if self.derived_dict is not None:
+            # the dict's there already (and a streamed part's items are gone)
+            tidied = tidy_dict(self.derived_dict)
+            if self.part_type in TYPE_REGISTRY:
+                return object_from_typed_dict(tidied)
+            return {key: object_from_typed_dict(value) for (key, value) in tidied.items()}
+
+        part_objects = set()  # ids of the objects built for sub parts - already settled
+
+        def build_sub_part(part: "DocPart"):
+            part_object = part.derive_object_for_part(context, level)
+            part_objects.add(id(part_object))
+            return part_object
+
+        the_values = self.gather_values(context, level, build_sub_part)
+
+        fields = {}
+        for (key, value) in the_values.items():
+            if key == "_type":
+                continue
+            settled_value = settle_value(value, part_objects)
+            if settled_value is not None:
+                fields[key] = settled_value
+
+        part_class = TYPE_REGISTRY.get(self.part_type)
+        if not part_class:
+            # as from_typed_dict() leaves a dict of an unknown _type
+            return {"_type": self.part_type, **fields}
+        return part_class.from_fields(fields)
+
+    def gather_values(self, context: ParserContext, level: int, derive_sub_part) -> Dict:
+        """
+        The part's values, by attribute name, as the handlers parse them.
+        derive_sub_part(part) gives the value for each sub part: its dict or its object.
+        """
         # identify the full oneliner - ie all text lines immediately after
         # the header should be included.
 
@@ -168,7 +283,7 @@ class DocPart:
                     emoji_dicts = emoji_list(full_label)
                     if emoji_dicts:
                         # print(f"found EMOJIS in label {emoji_dicts}: {full_label}")
-                        trimmed_label = replace_emoji(full_label, "").strip()
+                        trimmed_label = strip_emoji(full_label)
                         # print("trimmed label is ", trimmed_label)
                     else:
                         emoji_dicts = []
@@ -244,11 +359,11 @@ class DocPart:
                     the_dict["elaboration"] = old_paragraphs + paragraphs
                     paragraphs = ["Might be more2"]  # to avoid reinserting it
 
-                part_dict = item.derive_dict_for_part(level)
+                part_dict = derive_sub_part(item)
                 part_type = item.part_type
-                plural = part_plurals.get(part_type, part_type + "s'")
+                plural = context.part_plurals.get(part_type, part_type + "s'")
 
-                is_cum = part_type in listed_parts
+                is_cum = part_type in context.listed_parts
                 if is_cum:
                     att_name_for_part = SnakeCase(plural).content.lower()
                     # print("Using plural atttribute name: ", att_name_for_part)
@@ -287,7 +402,24 @@ class DocPart:
             # print(the_dict)
         # if the_dict.get("name", "") == "Component":
         #     exit(0)
-        return clean_dict(the_dict)
+        return the_dict
+
+
+def settle_value(value: Any, built: set):
+    """
+    A value from gather_values() as from_typed_dict() would have it after
+    clean_dict() and tidy_dict(). Objects in built (the sub parts) are taken as they are;
+    the rest are small values from the handlers, so they take the dict route.
+    """
+    if isinstance(value, str):
+        return value or None
+    if id(value) in built:
+        return value
+    if isinstance(value, list):
+        items = [settle_value(item, built) for item in value if item is not None]
+        items = [item for item in items if item is not None]
+        return items or None
+    return object_from_typed_dict(tidy_dict(clean_dict(value)))
 
 
 # @trace_decorator
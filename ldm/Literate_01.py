@@ -4,8 +4,9 @@ from __future__ import annotations
 from typing import List, Optional, Dict, Any, Union
 
 
-from utils.util_pydantic import PydanticMixin,  dataclass, field
+from utils.util_pydantic import PydanticMixin,  dataclass, field, COMPACT_TOKENS
 from utils.class_container import Container
+import utils.class_model_indexes as model_indexes
 from utils.debug_pydantic import debug_dataclass_creation
 from utils.class_casing import *
 from functools import cached_property # You need to import cached_property
@@ -94,12 +95,17 @@ class Cardinality(StrEnum):
 
 @dataclass 
 class Trivial():
-    pass
+    if COMPACT_TOKENS:
+        __slots__ = ()  # so compact subclasses don't get a __dict__ from here
 
 @dataclass
 class Natural(PydanticMixin, Trivial):
     content: str = ""
 
+    # in compact mode: slots, not a __dict__, for the fields and these
+    __compact__ = True
+    __compact_slots__ = ("_type",)
+
     def __str__(self):
         return self.content
 
@@ -284,21 +290,22 @@ class SubjectE(Component):
             self.subjects = []
         self.model_path = type(self).__name__ + "_" + self.name.content
 
-    def all_classes(self):
-        return self.all_classes_p
-    
-    @cached_property
-    def all_classes_p(self) -> List[Class]:
-        # print("Calcing all_classes for ", self)
-        # print(f"- locally, there are {len(self.classes)} classes for {self}")
-        
+    def all_classes(self) -> List[Class]:
+        """The classes here and in the subjects below - from the model's indexes, if it's in a model."""
+        model = self.containing(LiterateModel)
+        if model is not None:
+            classes = model.indexes_p.current().subject_classes(self)
+            if classes is not None:
+                return classes
+        return self.collect_classes()
+
+    def collect_classes(self) -> List[Class]:
         # Note. Need to make a copy of the list of classes
         # otherwise as all_classes gets extended, so does self.classes
         all_classes = [c for c in self.classes]
 
         for subject in self.subjects:
-            all_classes.extend(subject.all_classes_p)
-        # print(f"- allclasses for {self} contains {len(all_classes)}; locally just {len(self.classes)}")
+            all_classes.extend(subject.collect_classes())
         return all_classes
 
     def is_trivial(self):
@@ -377,41 +384,32 @@ class LiterateModel(SubjectB):
             print("Fixing LiterateModel name!")
             self.name = ModelName(self.name)
         self.set_containees_back()
-    
-    def all_class_names(self):
-        return self.all_class_names_p
-    
+
     @cached_property
-    def all_class_names_p(self) -> list[str]:
-        print("Calcing all_class names  for ", self)
+    def indexes_p(self) -> model_indexes.ClassIndexes:
+        return model_indexes.ClassIndexes(self)
+
+    def model_changed(self, changed: Optional[Component] = None):
+        """
+        Call after changing the model, so its indexes catch up: changed is the
+        Class that changed, or None if classes (or subjects) came or went.
+        """
+        self.indexes_p.note_change(changed)
+
+    def all_classes(self) -> List[Class]:
+        return self.indexes_p.current().classes
+
+    def all_class_names(self):
         return self.full_class_index().keys()
 
-    def class_index(self):
-        return self.class_index_p
-    
-    @cached_property
-    def class_index_p(self) -> dict[str, Class]:
-        the_index  = {str(c.name): c for c in self.all_classes()}
-        if None in the_index:
-            print("Found none in singular index")
-        return the_index
-    
-    def plural_index(self):
-        return self.plural_index_p
-    
-    @cached_property
-    def plural_index_p(self) -> dict[str, Class]:
-        the_index  = {c.derive_plural() : c for c in self.all_classes()}
-        if None in the_index:
-            print("Found none in p;ural index")
-        return the_index
-    
-    def full_class_index(self):
-        return self.full_class_index_p
-    
-    @cached_property
-    def full_class_index_p(self) -> dict[str, Class]:
-        return self.class_index() | self.plural_index()
+    def class_index(self) -> dict[str, Class]:
+        return self.indexes_p.current().by_name
+
+    def plural_index(self) -> dict[str, Class]:
+        return self.indexes_p.current().by_plural
+
+    def full_class_index(self) -> dict[str, Class]:
+        return self.indexes_p.current().full
 
     def class_named(self, cname: str)-> Class:
         return self.full_class_index().get(cname, None)
@@ -427,6 +425,7 @@ Subject = SubjectB
 
 
 
+
 @dataclass
 class DataType(PydanticMixin, Container):
     """A simple or complex data type"""
@@ -686,10 +685,27 @@ class Class(Component):
         return the_dict
     
     def all_attributes(self):
-        atts = self.attributes
+        return self.all_attributes_p
+
+    @cached_property
+    def all_attributes_p(self) -> tuple:
+        """The class's own attributes, then each section's. Read only; see attributes_changed()."""
+        atts = list(self.attributes)
         for section in self.attribute_sections:
             atts += section.attributes
-        return atts
+        return tuple(atts)
+
+    def declared_attributes(self) -> list:
+        """all_attributes(), less those validation implies (based on links, inverses, ...)."""
+        return [att for att in self.all_attributes() if not getattr(att, "implied_p", False)]
+
+    def attributes_changed(self):
+        """Forget what's been worked out from the attributes: call after adding an attribute or a section."""
+        for name in ("all_attributes_p", "attribute_names_p"):
+            self.__dict__.pop(name, None)
+        the_model = self.containing(LiterateModel)
+        if the_model:
+            the_model.model_changed(self)
     
     # calc derivation: plural
     def derive_plural(self) -> str:
@@ -870,6 +886,9 @@ class AttributeReference(PydanticMixin, Trivial, Container):
     attribute_name: AttributeName = None
     container: Optional["Container"] = field(default=None, kw_only=True)
 
+    __compact__ = True
+    __compact_slots__ = ("_type",)
+
     def containees(self):
         return [self.class_name, self.attribute_name]
 
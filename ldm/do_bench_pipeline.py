@@ -0,0 +1,115 @@
+"""Times the phases of build_dull_dsl on synthetic models of growing size.
+
+Run from the project root:
+    python -m ldm.do_bench_pipeline [classes ...]
+
+For each size (default 100 and 1000 classes) it writes a model with
+ldm_model_generator, builds it, and times each phase from the show_phase()
+calls the build makes. The report goes to bench_results/pipeline_report.json:
+- phases: seconds for parse, derive_dict, build_objects, validate, extract and html
+- all_phases: seconds for every phase the build showed, in order
+- error: how the build stopped, if it did (no Prince here is fine - html is done by then)
+"""
+
+import json
+import platform
+import sys
+import time
+from dataclasses import asdict
+from datetime import datetime
+from typing import Dict, List
+
+import dull_dsl.dull_build as dull_build
+from ldm.ldm_model_generator import ModelShape, write_model
+
+BENCH_DIR = "bench_results"
+REPORT_PATH = f"{BENCH_DIR}/pipeline_report.json"
+DEFAULT_SIZES = [100, 1000]
+
+# the phase that starts with each caption
+PHASES = {
+    "parse": "Parsing model",
+    "derive_dict": "Deriving dict from parse",
+    "build_objects": "Creating model from the parse",
+    "validate": "Validating model with validation faculty",
+    "extract": "Create extract for diagrams",
+    "html": "Creating HTML using the Faculty",
+}
+
+
+def shape_for(nclasses: int) -> ModelShape:
+    return ModelShape(subjects=max(1, nclasses // 10), classes=nclasses)
+
+
+def phase_seconds(phase_log, end_time: float) -> List[List]:
+    """[caption, seconds] for each phase: until the next one starts, or end_time for the last."""
+    timed = []
+    for (k, (caption, start)) in enumerate(phase_log):
+        end = phase_log[k + 1][1] if k + 1 < len(phase_log) else end_time
+        timed.append([caption, round(end - start, 4)])
+    return timed
+
+
+def bench_build(dull_specs: Dict, shape: ModelShape, model_name: str) -> Dict:
+    models_dir = f"{BENCH_DIR}/models"
+    nlines = write_model(f"{models_dir}/{model_name}/{model_name}.md", shape, model_name)
+    specs = dict(dull_specs, models_dir=models_dir, model_name=model_name, parse_cache=False)
+
+    print(f"\nBuilding {model_name}: {shape.classes} classes, {nlines} lines", file=sys.stderr)
+    dull_build.phase_log.clear()
+    error = None
+    stdout = sys.stdout  # the build sends stdout to its trace file
+    start = time.perf_counter()
+    try:
+        dull_build.build_dull_dsl(specs)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    finally:
+        end = time.perf_counter()
+        if sys.stdout is not stdout:
+            sys.stdout.close()
+            sys.stdout = stdout
+
+    all_phases = phase_seconds(dull_build.phase_log, end)
+    phases = {}
+    for (phase, caption_start) in PHASES.items():
+        for (caption, seconds) in all_phases:
+            if caption.startswith(caption_start):
+                phases[phase] = seconds
+                break
+
+    return {
+        "model": model_name,
+        "shape": asdict(shape),
+        "lines": nlines,
+        "total": round(end - start, 4),
+        "phases": phases,
+        "all_phases": all_phases,
+        "error": error,
+    }
+
+
+def bench_pipeline(dull_specs: Dict, sizes: List[int]) -> Dict:
+    report = {
+        "when": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "runs": [],
+    }
+    for nclasses in sizes:
+        run = bench_build(dull_specs, shape_for(nclasses), f"Bench{nclasses}")
+        report["runs"].append(run)
+        phases = ", ".join(f"{phase} {seconds:.2f}s" for (phase, seconds) in run["phases"].items())
+        print(f"\t{nclasses} classes: {run['total']:.2f}s - {phases}", file=sys.stderr)
+        if run["error"]:
+            print(f"\tstopped by {run['error']}", file=sys.stderr)
+    return report
+
+
+if __name__ == "__main__":
+    from ldm.do_build_ldm import ldm_dull_specs
+    from utils.util_fmk import write_text
+
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    report = bench_pipeline(ldm_dull_specs, sizes)
+    write_text(REPORT_PATH, json.dumps(report, indent=2))
+    print(f"\nReport in {REPORT_PATH}", file=sys.stderr)
@@ -375,6 +375,11 @@ if __name__ == "__main__":
     test_models = ["Diagrams"]
     test_models = ["Literate"]
 
+    # rebuilding an unchanged model reuses its parse (see dull_parse_cache)
+    ldm_dull_specs["parse_cache"] = True
+    # and the schema and survey of the metamodel, until it's edited (see dull_metamodel_cache)
+    ldm_dull_specs["metamodel_cache"] = True
+
     import traceback
     for model_name in test_models:
         
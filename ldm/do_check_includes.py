@@ -0,0 +1,83 @@
+"""Checks that a model split across files parses the same as the single file.
+
+Run from the project root:
+    python -m ldm.do_check_includes [model ...]
+
+For each model (default Literate, Diagrams and LiterateTester) it writes a
+split copy to a temporary directory: a main document of include lines only,
+one for the lines before the first subject (the model's header and text),
+then one per subject. It then compares the split copy's parse with the
+single file's - the displayed tree and the derived dict - for a parse with
+worker processes, a serial one, and a streaming one.
+"""
+
+import json
+import sys
+import tempfile
+from typing import Dict, List
+
+from dull_dsl.dull_parser import derive_dict_streaming, parse_model_doc
+from utils.util_fmk import read_lines, write_text
+
+DEFAULT_MODELS = ["Literate", "Diagrams", "LiterateTester"]
+SUBJECT_HEADER = "## "
+
+
+def write_split_model(lines: List[str], split_dir: str) -> str:
+    """Writes lines as a main document including a file per piece; returns its path."""
+    starts = [0] + [k for (k, line) in enumerate(lines) if k > 0 and line.startswith(SUBJECT_HEADER)]
+    main_lines = []
+    for (n, start) in enumerate(starts):
+        end = starts[n + 1] if n + 1 < len(starts) else len(lines)
+        name = f"Pieces/piece{n}.md"
+        write_text(f"{split_dir}/{name}", "\n".join(lines[start:end]) + "\n")
+        main_lines.append(f"<!-- include {name} -->")
+    main_path = f"{split_dir}/main.md"
+    write_text(main_path, "\n".join(main_lines) + "\n")
+    return main_path
+
+
+def derived_text(derive) -> str:
+    """The dict derive() gives, as text - or how it failed, which should be the same too."""
+    try:
+        return json.dumps(derive(), default=str)
+    except Exception as e:
+        return f"failed: {type(e).__name__}"
+
+
+def check_model(dull_specs: Dict, model_doc_path: str) -> bool:
+    lines = read_lines(model_doc_path)
+    whole = parse_model_doc(dull_specs, model_doc_path, processes=0)
+    whole_tree = whole.displayed()
+    whole_dict = derived_text(lambda: whole.derive_dict_for_document(dull_specs))
+    if whole_dict.startswith("failed"):
+        print(f"\tthe single file's dict {whole_dict}", file=sys.stderr)
+
+    all_same = True
+    with tempfile.TemporaryDirectory() as split_dir:
+        main_path = write_split_model(lines, split_dir)
+        for (how, processes) in [("workers", None), ("serial", 0)]:
+            split = parse_model_doc(dull_specs, main_path, processes=processes)
+            same_tree = split.displayed() == whole_tree
+            same_dict = derived_text(lambda: split.derive_dict_for_document(dull_specs)) == whole_dict
+            print(f"\t{how}: same tree {same_tree}, same dict {same_dict}", file=sys.stderr)
+            all_same = all_same and same_tree and same_dict
+
+        same_dict = derived_text(lambda: derive_dict_streaming(dull_specs, main_path)[1]) == whole_dict
+        print(f"\tstreaming: same dict {same_dict}", file=sys.stderr)
+        all_same = all_same and same_dict
+    return all_same
+
+
+if __name__ == "__main__":
+    from ldm.do_build_ldm import ldm_dull_specs
+
+    models = sys.argv[1:] or DEFAULT_MODELS
+    models_dir = ldm_dull_specs["models_dir"]
+    failed = []
+    for model_name in models:
+        print(f"\n{model_name}", file=sys.stderr)
+        if not check_model(ldm_dull_specs, f"{models_dir}/{model_name}/{model_name}.md"):
+            failed.append(model_name)
+    print(f"\n{len(models) - len(failed)} of {len(models)} split the same", file=sys.stderr)
+    sys.exit(1 if failed else 0)
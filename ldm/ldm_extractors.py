@@ -80,7 +80,7 @@ class Extractors(Faculty):
             edge = create_edge("based_on", base_ref.content, "M:1")
             edges.append(edge)
         
-        for attribute in cls.attributes:
+        for attribute in cls.declared_attributes():
             att_name = attribute.name.content
             (target_type, card) = core_type(attribute)
             if not target_type:
@@ -0,0 +1,146 @@
+"""
+Writes synthetic Literate models, for seeing how the pipeline scales.
+
+The models are made of the same pieces as the hand-written ones: the
+Component class the build expects, then subjects with classes, attributes with data types, Subtype of and Based on clauses,
+annotations, and elaborations with the odd code block. ModelShape says how
+many of each; the same shape (and seed) always gives the same document.
+
+    from ldm.ldm_model_generator import ModelShape, write_model
+    write_model("Bench/Bench.md", ModelShape(classes=1000))
+"""
+
+import random
+from dataclasses import dataclass
+from typing import List
+
+from utils.util_fmk import write_text
+
+NOUNS = [
+    "Account", "Order", "Invoice", "Customer", "Product", "Shipment", "Payment", "Ledger",
+    "Contract", "Supplier", "Warehouse", "Region", "Employee", "Project", "Task", "Budget",
+]
+ATTRIBUTE_WORDS = [
+    "name", "code", "status", "amount", "startDate", "endDate", "owner", "priority",
+    "category", "reference", "quantity", "total", "label", "summary", "source", "target",
+]
+SIMPLE_TYPES = ["String", "Integer", "Boolean", "Date", "CamelName", "Decimal"]
+ANNOTATION_LABELS = ["Note", "Issue", "Example", "Default"]
+COMPONENT_LINES = [
+    "## Preliminaries - the basic structure of the model",
+    "",
+    "_ **Component** - an element or building block of the model",
+    "- **name** - the name of the component (CamelName)",
+    "- **oneLiner** - a brief description of the component (RichLine)",
+    "",
+    "__ ***For Machinery*** - mechanical attributes",
+    "- **isEmbellishment** - whether the component was added after parsing (Boolean)",
+    "    Default: false",
+    "",
+]
+WORDS = (
+    "the model keeps track of each item as it moves through the system and "
+    "records who changed it when and why so that later reviews can follow along"
+).split()
+
+
+@dataclass
+class ModelShape:
+    subjects: int = 10
+    classes: int = 100  # spread evenly over the subjects
+    attributes_per_class: int = 8
+    subtype_depth: int = 3  # classes in a Subtype of chain, below its root
+    based_on_depth: int = 1  # chains of Based on, between the roots of subtype chains
+    annotation_density: float = 0.2  # chance of an annotation on each class and attribute
+    code_block_density: float = 0.1  # chance of a code block in a class's elaboration
+    seed: int = 0
+
+
+def spelled(k: int) -> str:
+    """k in letters - A, B, .. Z, Ba, Bb, .. - since casing drops the digits from names."""
+    letters = ""
+    while True:
+        letters = chr(ord("a") + k % 26) + letters
+        k //= 26
+        if not k:
+            return letters.capitalize()
+
+
+def class_name(k: int) -> str:
+    return f"{NOUNS[k % len(NOUNS)]}{spelled(k)}"
+
+
+def sentence(rng: random.Random, nwords: int = 8) -> str:
+    start = rng.randrange(len(WORDS) - nwords)
+    return " ".join(WORDS[start : start + nwords])
+
+
+def generate_model(shape: ModelShape, model_name: str = "Bench Model") -> List[str]:
+    """The lines of a model document of the given shape."""
+    rng = random.Random(shape.seed)
+    lines = [f"# {model_name}", "", sentence(rng, 12).capitalize() + ".", ""]
+    lines.extend(COMPONENT_LINES)
+
+    nsubjects = max(shape.subjects, 1)
+    chain_length = shape.subtype_depth + 1
+    k = 0
+    for subject in range(nsubjects):
+        lines.extend([f"## Subject{spelled(subject)} - {sentence(rng, 5)}", ""])
+        # the first subjects take any classes left over
+        nclasses = shape.classes // nsubjects + (1 if subject < shape.classes % nsubjects else 0)
+        for _ in range(nclasses):
+            lines.extend(class_lines(shape, rng, k, chain_length))
+            k += 1
+    return lines
+
+
+def class_lines(shape: ModelShape, rng: random.Random, k: int, chain_length: int) -> List[str]:
+    lines = [f"_ **{class_name(k)}** - {sentence(rng)}"]
+
+    position = k % chain_length
+    if position > 0:
+        lines.append(f"Subtype of: {class_name(k - 1)}")
+    else:
+        # roots of subtype chains are Components, based on the root before them
+        lines.append("Subtype of: Component")
+        root = k // chain_length
+        if root % (shape.based_on_depth + 1) > 0:
+            lines.append(f"Based on: {class_name(k - chain_length)}")
+
+    lines.extend(["", sentence(rng, 14).capitalize() + "."])
+    if rng.random() < shape.code_block_density:
+        lines.extend(["```", f"{class_name(k)}.create(code='{k}')", "```"])
+    lines.append("")
+
+    if rng.random() < shape.annotation_density:
+        lines.append(f"{rng.choice(ANNOTATION_LABELS[:2])}: {sentence(rng)}")
+
+    for a in range(shape.attributes_per_class):
+        lines.extend(attribute_lines(shape, rng, k, a))
+    lines.append("")
+    return lines
+
+
+def attribute_lines(shape: ModelShape, rng: random.Random, k: int, a: int) -> List[str]:
+    word = ATTRIBUTE_WORDS[a % len(ATTRIBUTE_WORDS)]
+    name = word if a < len(ATTRIBUTE_WORDS) else f"{word}{spelled(a // len(ATTRIBUTE_WORDS))}"
+
+    choice = rng.random()
+    if k > 0 and choice < 0.2:
+        data_type = f"optional {class_name(rng.randrange(k))}"
+    elif k > 0 and choice < 0.3:
+        data_type = f"List of {class_name(rng.randrange(k))}"
+    else:
+        data_type = rng.choice(SIMPLE_TYPES)
+
+    lines = [f"- **{name}** - {sentence(rng, 6)} ({data_type})"]
+    if rng.random() < shape.annotation_density:
+        lines.append(f"    {rng.choice(ANNOTATION_LABELS)}: {sentence(rng, 6)}")
+    return lines
+
+
+def write_model(model_doc_path: str, shape: ModelShape, model_name: str = "Bench Model") -> int:
+    """Writes the model; returns the number of lines."""
+    lines = generate_model(shape, model_name)
+    write_text(model_doc_path, "\n".join(lines) + "\n")
+    return len(lines)
@@ -1,6 +1,7 @@
 import re
 from dataclasses import dataclass
 from abc import ABC
+from functools import lru_cache
 
 # from typing import Any, List, Dict, Tuple, Union, Callable, Optional
 from typing import Any, List, Dict, Tuple, Optional
@@ -109,6 +110,34 @@ keywords = [
     Keyword("AnAnnotation"),
 ]
 
+# line_starts, by first character - same order within each
+line_starts_by_char: Dict[str, List[LineStart]] = {}
+for _line_start in line_starts:
+    line_starts_by_char.setdefault(_line_start.starter[0], []).append(_line_start)
+
+
+# All the patterns, compiled once
+EMPHASIS_PATTERN = re.compile(r"[*_]+")
+LINK_PATTERN = re.compile(r"\[([^\]]+)\]\([^)]+\)")
+TRAILING_COLONS_PATTERN = re.compile(r":+\s*$")
+COMMA_PATTERN = re.compile(r",\s*")
+DOT_PATTERN = re.compile(r"\.\s*")
+EMOJI_LABEL_PATTERN = re.compile(r"^([\U0001F300-\U0001F9FF]+)\s+([^:]+):(.*)")
+LABEL_PATTERN = re.compile(r"^([^:]+):(.*)")
+MARKED_LABEL_PATTERN = re.compile(r"^([*_]*[^:]+[*_]*):(.*)")
+HEADER_NAME_PATTERN = re.compile(r"^([^-\(]+)(?:[-\(]|$)")
+HEADER_ONE_LINER_PATTERN = re.compile(r"^([^\(]+)(?:\(|$)")
+HEADER_PARENTHETICAL_PATTERN = re.compile(r"^\(([^\)]+)\)")
+
+SYLLABLE = r"[A-Za-z][A-Za-z0-9]*"
+IDENTIFIER = rf"{SYLLABLE}(SYLLABLE)*"
+IDENTIFIERS = rf"{IDENTIFIER}(\s+{IDENTIFIER})*"
+IDENTIFIERS_PATTERN = re.compile(IDENTIFIERS)
+
+# Headers and annotations are parsed once per distinct text; models repeat
+# the same shapes a lot (e.g. "- name - ... (optional X)")
+PARSE_CACHE_SIZE = 4096
+
 
 def parse_name(input_str: str) -> str:
     """Extract a bare name from text that might include markdown formatting."""
@@ -117,13 +146,13 @@ def parse_name(input_str: str) -> str:
 
     # First, remove markdown formatting symbols
     # Remove bold and italic markers (*, _, **, __)
-    cleaned = re.sub(r"[*_]+", "", input_str)
+    cleaned = EMPHASIS_PATTERN.sub("", input_str)
 
     # Remove any markdown links [text](url) -> text
-    cleaned = re.sub(r"\[([^\]]+)\]\([^)]+\)", r"\1", cleaned)
+    cleaned = LINK_PATTERN.sub(r"\1", cleaned)
 
     # Remove any trailing colons
-    cleaned = re.sub(r":+\s*$", "", cleaned)
+    cleaned = TRAILING_COLONS_PATTERN.sub("", cleaned)
 
     # Remove any leading/trailing whitespace
     cleaned = cleaned.strip()
@@ -132,11 +161,7 @@ def parse_name(input_str: str) -> str:
 
 
 def is_name(name: str) -> bool:
-    SYLLABLE = r"[A-Za-z][A-Za-z0-9]*"
-    IDENTIFIER = rf"{SYLLABLE}(SYLLABLE)*"
-    IDENTIFIERS = rf"{IDENTIFIER}(\s+{IDENTIFIER})*"
-
-    return re.fullmatch(IDENTIFIERS, str(name))
+    return IDENTIFIERS_PATTERN.fullmatch(str(name))
 
 
 @dataclass
@@ -207,23 +232,7 @@ TRIVIAL_HANDLER = ParseTrivial()
 class ParseName(ParseHandler):
 
     def parse(self, input_str: str) -> str:
-        if not input_str:
-            return ""
-
-        # First, remove markdown formatting symbols
-        # Remove bold and italic markers (*, _, **, __)
-        cleaned = re.sub(r"[*_]+", "", input_str)
-
-        # Remove any markdown links [text](url) -> text
-        cleaned = re.sub(r"\[([^\]]+)\]\([^)]+\)", r"\1", cleaned)
-
-        # Remove any trailing colons
-        cleaned = re.sub(r":+\s*$", "", cleaned)
-
-        # Remove any leading/trailing whitespace
-        cleaned = cleaned.strip()
-
-        return cleaned
+        return parse_name(input_str)
 
     def render(self, saved: str) -> str:
         return saved
@@ -298,7 +307,7 @@ class ParseNameList(ParseHandler):
             return []
 
         # Split by commas
-        parts = re.split(r",\s*", input_str)
+        parts = COMMA_PATTERN.split(input_str)
 
         # Clean each part
         cleaned_names = [parse_name(part) for part in parts]
@@ -337,7 +346,7 @@ class ParseAttributeReference(ParseHandler):
         cleaned = parse_name(input_str)
 
         # Split by dot
-        parts = re.split(r"\.\s*", str(cleaned), 1)
+        parts = DOT_PATTERN.split(str(cleaned), 1)
         class_name = ClassReference(content=parts[0].strip())
         attribute_name = AttributeName(parts[1].strip()) if len(parts) > 1 else ""
 
@@ -381,6 +390,19 @@ class ParseAttributeReference(ParseHandler):
 def parse_input_line(input_str: str) -> dict:
     """
     Parse an input line to determine its type and extract components.
+    Cached on the text: the dict is a fresh one each time, but what's in it is shared.
+"""
+    return dict(cached_input_line(input_str))
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def cached_input_line(input_str: str) -> dict:
+    return parse_input_line_uncached(input_str)
+
+
+def parse_input_line_uncached(input_str: str) -> dict:
+    """
+    Parse an input line to determine its type and extract components.
 
     Returns a dict with keys that might include:
     - line_type: The type of line (header, labeled_value, etc.)
@@ -396,7 +418,7 @@ def parse_input_line(input_str: str) -> dict:
     line = input_str.strip()
 
     # Check for line starters
-    for starter in line_starts:
+    for starter in line_starts_by_char.get(line[:1], []):
         if line.startswith(starter.starter):
             # It's a header or special line type
             rest = line[len(starter.starter) :].strip()
@@ -411,7 +433,7 @@ def parse_input_line(input_str: str) -> dict:
             }
 
     # Check for emoji followed by label and colon
-    emoji_match = re.match(r"^([\U0001F300-\U0001F9FF]+)\s+([^:]+):(.*)", line)
+    emoji_match = EMOJI_LABEL_PATTERN.match(line)
     if emoji_match:
         print("Found emoji match in parse_input_line")
         return {
@@ -421,7 +443,7 @@ def parse_input_line(input_str: str) -> dict:
             "value": emoji_match.group(3).strip(),
         }
     # Check for label and colon
-    label_match = re.match(r"^([^:]+):(.*)", line)
+    label_match = LABEL_PATTERN.match(line)
     if label_match:
         return {
             "line_type": "labeled_value",
@@ -472,13 +494,24 @@ def parse_header(header: str) -> dict:
     - name: The extracted name
     - one_liner: The one-liner description (if present)
     - parenthetical: The content in parentheses (if present)
+
+    Cached on the header text: the dict is a fresh one each time, but what's in it is shared.
     """
+    return dict(cached_header(header))
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def cached_header(header: str) -> dict:
+    return parse_header_uncached(header)
+
+
+def parse_header_uncached(header: str) -> dict:
     # print(f"\n\n===\nParsingHeader header: {header}")
 
     result = {"prefix": "", "name": None, "one_liner": None, "parenthetical": ""}
 
     # First, identify the line type and get the rest of the line
-    parsed = parse_input_line(header)
+    parsed = parse_input_line_uncached(header)
     # print("PARSED AS INPUT LINE ", parsed)
     if "rest_of_line" not in parsed:
         print("No rest of line")
@@ -491,7 +524,7 @@ def parse_header(header: str) -> dict:
     rest = parsed.get("rest_of_line", "")
 
     # Extract name (everything up to a dash or parenthesis)
-    name_match = re.match(r"^([^-\(]+)(?:[-\(]|$)", rest)
+    name_match = HEADER_NAME_PATTERN.match(rest)
 
     if name_match:
         raw_name = parse_name(name_match.group(1)).replace(":", "")
@@ -521,14 +554,14 @@ def parse_header(header: str) -> dict:
     # Extract one-liner (between dash and parenthesis, if present)
     if rest.startswith("-"):
         rest = rest[1:].strip()  # Remove the dash
-        one_liner_match = re.match(r"^([^\(]+)(?:\(|$)", rest)
+        one_liner_match = HEADER_ONE_LINER_PATTERN.match(rest)
         if one_liner_match:
             content = one_liner_match.group(1).strip()
             result["one_liner"]  = {"_type": "OneLiner", "content": content}
             rest = rest[len(one_liner_match.group(1)) :].strip()
 
     # Extract parenthetical
-    parenthetical_match = re.match(r"^\(([^\)]+)\)", rest)
+    parenthetical_match = HEADER_PARENTHETICAL_PATTERN.match(rest)
     parenthetical = ""
     if parenthetical_match:
 
@@ -669,7 +702,7 @@ def parse_input_line2(input_str: str) -> dict:
         return {"line_type": "marked_text_end"}
 
     # Check for line starters
-    for starter in line_starts:
+    for starter in line_starts_by_char.get(line[:1], []):
         if line.startswith(starter.starter):
             # It's a header or special line type
             rest = line[len(starter.starter) :].strip()
@@ -680,7 +713,7 @@ def parse_input_line2(input_str: str) -> dict:
             }
 
     # Check for emoji followed by label and colon
-    emoji_match = re.match(r"^([\U0001F300-\U0001F9FF]+)\s+([^:]+):(.*)", line)
+    emoji_match = EMOJI_LABEL_PATTERN.match(line)
     if emoji_match:
         return {
             "line_type": "labeled_value",
@@ -690,7 +723,7 @@ def parse_input_line2(input_str: str) -> dict:
         }
 
     # Check for label and colon (with potential markdown formatting)
-    label_match = re.match(r"^([*_]*[^:]+[*_]*):(.*)", line)
+    label_match = MARKED_LABEL_PATTERN.match(line)
     if label_match:
         return {
             "line_type": "labeled_value",
@@ -737,6 +770,20 @@ def parse_annotation(input_str: str) -> dict:
     # return the_dict
 
 
+def parse_cache_stats() -> Dict[str, Dict[str, int]]:
+    """Hits and misses of the header and annotation caches."""
+    stats = {}
+    for (what, cached) in [("headers", cached_header), ("lines", cached_input_line)]:
+        info = cached.cache_info()
+        stats[what] = {"hits": info.hits, "misses": info.misses, "cached": info.currsize}
+    return stats
+
+
+def clear_parse_caches():
+    cached_header.cache_clear()
+    cached_input_line.cache_clear()
+
+
 def validate_annotation(the_dict: Dict) -> Tuple[bool, Optional[str]]:
     label = the_dict.get("label", None)
     if not label:
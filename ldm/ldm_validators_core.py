@@ -190,6 +190,7 @@ def calc_dependents(model: LiterateModel):
         dependents_list = [ClassReference(d) for d in deps]
         # print("And the list is ", dependents_list)
         base_class.dependents = dependents_list
+        model.model_changed(base_class)
 
 
 def calc_subtypings(model: LiterateModel):
@@ -225,6 +226,7 @@ def calc_subtypings(model: LiterateModel):
                 print("No place to put subtypings for: ", supertype)
                 continue
             the_class.subtypings.append(subtyping_obj)
+            model.model_changed(the_class)
 
 
 def calc_component(obj):
@@ -244,7 +246,7 @@ def calc_class(cls):
 
     calc_base_attribute(cls)
 
-    for attribute in cls.attributes:
+    for attribute in cls.declared_attributes():
         calc_attribute(cls, attribute)
 
 
@@ -256,7 +258,8 @@ def calc_base_attribute(cls: Class):
         # print(repr(base_name))
         based_on_name_str = base_name.content
         att_name = AttributeName(f"base{based_on_name_str}")
-        dt = BaseDataType(class_name=base_name, as_value_type=AsValue(False))
+        # its own reference: base_name stays where it is, in cls.based_on
+        dt = BaseDataType(class_name=ClassReference(based_on_name_str), as_value_type=AsValue(False))
         dtc = DataTypeClause(
             data_type=dt,
             is_optional=IsOptional(False),
@@ -282,8 +285,10 @@ def add_implied_attribute(cls: Class, att: Attribute):
         cls, f"Implied Attributes", create_section=True, one_liner = f"created for {cname}"
     )
 
+    att.implied_p = True  # for declared_attributes(); not serialized, as is_embellishment would be
     implied_atts.attributes.append(att)
-    implied_atts.set_containees_back(verbose=False)
+    cls.attributes_changed()
+    implied_atts.attach(att)
     # print("Added implied attribute: ", att, " in ", cls)
     # print("... Containees of section are: ", ids_for(implied_atts.clean_containees()))
     # print("... Containees of att are: ", ids_for(att.clean_containees()))
@@ -311,8 +316,8 @@ def att_section_named(cls: Class, new_section_name: str, create_section=False, o
     section.one_liner = OneLiner(one_liner)
     # print(f"Creating section for {cls}: {section}")
     cls.attribute_sections.append(section)
-    # cls.set_containees_back(verbose=True)
-    cls.set_containees_back(verbose=False)
+    cls.attributes_changed()
+    cls.attach(section)
 
     return section
 
@@ -320,7 +325,7 @@ def countEmbellishments(model: LiterateModel, caption):
     print("Embellishment counting - ", caption)
     
     compclass = model.class_named("Component")
-    attributes = compclass.attributes
+    attributes = compclass.declared_attributes()
     natts = len(attributes)
     print(natts, " attributes in Component")
     
@@ -418,12 +423,13 @@ def calc_attribute_inverse(cls: Class, attribute: Attribute):
     add_implied_attribute(target_cls, inverse_att)
 
     # create inverse attributes for the original and for the implied invers
-    inverse_att.inverse = AttributeReference(
+    inverse_att.set_contained("inverse", AttributeReference(
         class_name=ClassReference(cname), attribute_name=AttributeName(aname)
-    )
-    attribute.inverse = AttributeReference(
-        class_name=ClassReference(target_type), attribute_name=inverse_att_name
-    )
+    ))
+    # its own name: a shared one would be contained in whichever side was attached last
+    attribute.set_contained("inverse", AttributeReference(
+        class_name=ClassReference(target_type), attribute_name=AttributeName(inverse_att_name.content)
+    ))
 
     # And still have to add inverse clauses on both sides
 
@@ -475,7 +481,7 @@ def calc_attribute_override(cls: Class, attribute):
 
         newname = AttributeName(aname)
         # print(".. and as AName: ", repr(newname))
-        attribute.overrides = AttributeReference(ClassReference(mro), newname)
+        attribute.set_contained("overrides", AttributeReference(ClassReference(mro), newname))
         break
 
 
@@ -524,9 +530,6 @@ class Validators(Faculty):
         The_Model = self
         calc_model(self)
 
-        # call precalc a second time to include all the implied attributes
-        precalc_model(self)
-
         # Call super validator with explicit class name
         print("Validating LiterateModel")
         _validation_faculty.call_super_validate(self, "LiterateModel")
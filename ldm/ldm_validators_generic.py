@@ -13,6 +13,8 @@ from typing import (
     Callable,
 )
 
+from utils.class_container import note_module_mismatch
+
 def create_field_error(obj, category, message):
     """
     Helper function to log or handle validation errors.
@@ -85,11 +87,30 @@ def check_type(value: Any, expected_type: Any) -> bool:
     return check_simple_type(value, expected_type)
 
 
+# (class of the value, expected_type) -> check_simple_type's answer
+simple_type_matches: typing.Dict[Tuple[type, Any], bool] = {}
+
+
 def check_simple_type(value: Any, expected_type: Any) -> bool:
     """
     Check simple (non-generic) types, handling module import issues.
+    The answer depends only on the value's class, so is worked out once per
+    pair, by simple_type_match.
     """
-    
+    key = (value.__class__, expected_type)
+    try:
+        return simple_type_matches[key]
+    except KeyError:
+        pass
+    except TypeError:
+        return simple_type_match(value, expected_type)  # an unhashable expected_type
+
+    matched = simple_type_match(value, expected_type)
+    simple_type_matches[key] = matched
+    return matched
+
+
+def simple_type_match(value: Any, expected_type: Any) -> bool:
     if expected_type == typing.Any:
         return True
 
@@ -104,7 +125,7 @@ def check_simple_type(value: Any, expected_type: Any) -> bool:
         
         if expected_name == actual_name:
             # Same class name - probably same class from different imports
-            # print(f"Type name match: {expected_name} == {actual_name} (different modules)")
+            note_module_mismatch(value.__class__, expected_type)
             return True
         
         # Check if it's a subclass relationship
@@ -1,5 +1,11 @@
 import re
 
+# Pattern for list/set - case insensitive
+list_set_pattern = re.compile(r'^(list\s*of|listof|set\s*of|setof)\s+(.+)$', re.IGNORECASE)
+
+# Pattern for mapping - case insensitive
+mapping_pattern = re.compile(r'^(mapping\s+from)\s+(.+?)\s+to\s+(.+)$', re.IGNORECASE)
+
 def parse_dt_phrase(phrase):
     # Initialize return values
     qualifier = None
@@ -9,12 +15,6 @@ def parse_dt_phrase(phrase):
     # Convert to string in case another type is passed
     phrase = str(phrase).strip()
     
-    # Pattern for list/set - case insensitive
-    list_set_pattern = re.compile(r'^(list\s*of|listof|set\s*of|setof)\s+(.+)$', re.IGNORECASE)
-    
-    # Pattern for mapping - case insensitive
-    mapping_pattern = re.compile(r'^(mapping\s+from)\s+(.+?)\s+to\s+(.+)$', re.IGNORECASE)
-    
     # Check for list/set pattern
     list_set_match = list_set_pattern.match(phrase)
     if list_set_match:
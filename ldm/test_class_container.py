@@ -0,0 +1,69 @@
+"""
+all_contained() on a model, which comes from the model's registry, against
+walk_contained(), which walks the tree, before and after validation changes
+the model.
+
+Run from the project root, as the builds are.
+"""
+
+import pytest
+
+from ldm.do_build_ldm import ldm_dull_specs
+from dull_dsl.dull_parser import parse_model_doc
+from dull_dsl.dull_parser_core import DocPart
+import ldm.ldm_validators_core as ldm_validators
+from ldm.Literate_01 import (
+    Attribute,
+    AttributeName,
+    AttributeReference,
+    ClassReference,
+    Component,
+)
+from utils.class_container import Container
+
+MODEL_NAME = "Literate"
+CHECKED_TYPES = [Container, Component, Attribute, AttributeName, ClassReference, AttributeReference]
+
+
+def parsed_model():
+    model_doc_path = f"{ldm_dull_specs['models_dir']}/{MODEL_NAME}/{MODEL_NAME}.md"
+    doc_part = parse_model_doc(ldm_dull_specs, model_doc_path, processes=0)
+    model_part = next(
+        part for part in doc_part.items if isinstance(part, DocPart) and part.part_type == "LiterateModel"
+    )
+    the_model = model_part.derive_object_for_document(ldm_dull_specs)
+    the_model.all_contained(Container)  # the registry is made before anything changes the model
+    return the_model
+
+
+def same_containers(found, expected) -> bool:
+    # the registry keeps attach order, not the walk's
+    return sorted(map(id, found)) == sorted(map(id, expected))
+
+
+@pytest.fixture(scope="module")
+def validated_model():
+    the_model = parsed_model()
+    ldm_validators.validate_model(the_model)
+    return the_model
+
+
+@pytest.mark.parametrize("ctype", CHECKED_TYPES, ids=lambda ctype: ctype.__name__)
+def test_all_contained_matches_walk_after_validation(validated_model, ctype):
+    assert same_containers(validated_model.all_contained(ctype), validated_model.walk_contained(ctype))
+
+
+def test_set_contained_detaches_what_it_replaces():
+    the_model = parsed_model()
+    attribute = the_model.all_contained(Attribute)[0]
+    first = AttributeReference(class_name=ClassReference("First"), attribute_name=AttributeName("first"))
+    second = AttributeReference(class_name=ClassReference("Second"), attribute_name=AttributeName("second"))
+
+    attribute.set_contained("overrides", first)
+    attribute.set_contained("overrides", second)
+
+    references = the_model.all_contained(AttributeReference)
+    assert any(reference is second for reference in references)
+    assert not any(reference is first for reference in references)
+    assert first.container is None
+    assert same_containers(the_model.all_contained(Container), the_model.walk_contained(Container))
@@ -0,0 +1,55 @@
+"""Super calls through a Faculty, with and without the class name."""
+
+from utils.class_faculty import Faculty, faculty_class, patch_on
+
+
+class Base:
+    pass
+
+
+class Middle(Base):
+    pass
+
+
+class Leaf(Middle):
+    pass
+
+
+@faculty_class
+class Namers(Faculty):
+    """Patches defined in the class body, as Validators, Htmlers and Extractors have them."""
+
+    def call_super_name(self, obj, current_class_name: str = None):
+        return self.call_super_method(obj, "name_of", current_class_name)
+
+    @patch_on(Base, "name_of")
+    def name_base(self):
+        return "Base"
+
+    @patch_on(Middle, "name_of")
+    def name_middle(self):
+        # no class name: found from the caller
+        return "Middle+" + _namers.call_super_method(self, "name_of")
+
+    @patch_on(Leaf, "name_of")
+    def name_leaf(self):
+        # no class name, through the helper
+        return "Leaf+" + _namers.call_super_name(self)
+
+
+_namers = Namers()
+
+
+def test_super_call_without_class_name():
+    name_of = _namers.resolve_patched_method(Middle(), "name_of")
+    assert name_of(Middle()) == "Middle+Base"
+
+
+def test_super_call_through_helper_without_class_name():
+    name_of = _namers.resolve_patched_method(Leaf(), "name_of")
+    assert name_of(Leaf()) == "Leaf+Middle+Base"
+
+
+def test_super_call_with_class_name():
+    assert _namers.call_super_name(Leaf(), "Leaf") == "Middle+Base"
+
@@ -0,0 +1,65 @@
+"""
+A model's class indexes catch up with it after model_changed(): looked at
+again when a class changes, built again only if a name or plural did (or
+classes came or went).
+
+Run from the project root, as the builds are.
+"""
+
+import pytest
+
+from ldm.do_build_ldm import ldm_dull_specs
+from dull_dsl.dull_parser import parse_model_doc
+from dull_dsl.dull_parser_core import DocPart
+from utils.util_pydantic import TYPE_REGISTRY
+
+MODEL_NAME = "Mini"
+
+
+@pytest.fixture
+def the_model():
+    model_doc_path = f"{ldm_dull_specs['models_dir']}/{MODEL_NAME}/{MODEL_NAME}.md"
+    doc_part = parse_model_doc(ldm_dull_specs, model_doc_path, processes=0)
+    model_part = next(
+        part for part in doc_part.items if isinstance(part, DocPart) and part.part_type == "LiterateModel"
+    )
+    return model_part.derive_object_for_document(ldm_dull_specs)
+
+
+def test_renamed_class_is_found_by_its_new_name(the_model):
+    cls = the_model.class_named("AnnotationType")
+    assert cls is not None
+
+    cls.name = TYPE_REGISTRY["ClassName"]("Note Kind")
+    the_model.model_changed(cls)
+
+    assert the_model.class_named("NoteKind") is cls
+    assert the_model.class_named("AnnotationType") is None
+    assert the_model.plural_index()[cls.derive_plural()] is cls
+
+
+def test_added_class_is_indexed_after_model_changed(the_model):
+    subject = the_model.subjects[0]
+    classes_before = len(the_model.all_classes())
+
+    extra = TYPE_REGISTRY["Class"](name=TYPE_REGISTRY["ClassName"]("Extra Thing"))
+    subject.classes.append(extra)
+    subject.attach(extra)
+    the_model.model_changed()
+
+    assert the_model.class_named("ExtraThing") is extra
+    assert len(the_model.all_classes()) == classes_before + 1
+    assert any(c is extra for c in subject.all_classes())
+
+
+def test_changed_class_with_the_same_names_is_not_rebuilt(the_model, monkeypatch):
+    cls = the_model.all_classes()[0]
+    indexes = the_model.indexes_p.current()
+    rebuilds = []
+    monkeypatch.setattr(indexes, "rebuild", lambda: rebuilds.append(True))
+
+    the_model.model_changed(cls)  # say, an attribute was added: its name and plural are as they were
+
+    assert the_model.class_named(str(cls.name)) is cls
+    assert rebuilds == []
+    assert indexes.built_version == indexes.version
@@ -0,0 +1,64 @@
+"""
+A model made with compact tokens (LITERATE_COMPACT_TOKENS=1: slots rather
+than a __dict__) round-trips as one made without: to its typed dict, back to
+objects, and through pickle (as the parse cache keeps it) - and gives the
+same typed dict.
+
+COMPACT_TOKENS is fixed when the model classes are defined, so each mode is
+run in its own process. Run from the project root, as the builds are.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+MODEL_NAME = "Mini"
+
+ROUND_TRIP = """
+import json
+import pickle
+import sys
+
+from ldm.do_build_ldm import ldm_dull_specs
+from dull_dsl.dull_parser import parse_model_doc
+from dull_dsl.dull_parser_core import DocPart
+from utils.typed_dict_tools_diff import TypedDict
+from utils.util_pydantic import COMPACT_TOKENS
+
+model_name = sys.argv[1]
+doc_part = parse_model_doc(ldm_dull_specs, f"{ldm_dull_specs['models_dir']}/{model_name}/{model_name}.md", processes=0)
+model_part = next(part for part in doc_part.items if isinstance(part, DocPart) and part.part_type == "LiterateModel")
+the_model = model_part.derive_object_for_document(ldm_dull_specs)
+
+typed_dict = TypedDict(the_model)
+print(json.dumps({
+    "compact": COMPACT_TOKENS,
+    "name_has_dict": hasattr(the_model.name, "__dict__"),
+    "typed_dict": typed_dict.to_json(),
+    "rebuilt": TypedDict(typed_dict.to_object()).to_json(),
+    "unpickled": TypedDict(pickle.loads(pickle.dumps(the_model))).to_json(),
+}))
+"""
+
+
+def round_trip(compact: bool) -> dict:
+    env = dict(os.environ, LITERATE_COMPACT_TOKENS="1" if compact else "0", PYTHONIOENCODING="utf-8")
+    env["PYTHONPATH"] = os.pathsep.join([".", "ldm", env.get("PYTHONPATH", "")])
+    result = subprocess.run(
+        [sys.executable, "-c", ROUND_TRIP, MODEL_NAME],
+        env=env, capture_output=True, encoding="utf-8", check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_compact_tokens_round_trip():
+    normal = round_trip(compact=False)
+    compact = round_trip(compact=True)
+
+    assert (normal["compact"], compact["compact"]) == (False, True)
+    assert normal["name_has_dict"] and not compact["name_has_dict"]
+    for made in (normal, compact):
+        assert made["rebuilt"] == made["typed_dict"]
+        assert made["unpickled"] == made["typed_dict"]
+    assert compact["typed_dict"] == normal["typed_dict"]
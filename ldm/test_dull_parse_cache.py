@@ -0,0 +1,66 @@
+"""
+parse_cache_key() misses when anything a cached parse depends on changes -
+including modules the parser reaches only through others.
+
+Run from the project root, as the builds are.
+"""
+
+import pytest
+
+import dull_dsl.dull_parse_cache as dull_parse_cache
+from dull_dsl.dull_parse_cache import PARSER_MODULES, modules_used, parse_cache_key
+from ldm.do_build_ldm import ldm_dull_specs
+import ldm.do_check_includes
+
+# as dull_build names them
+CODE_MODULES = ["ldm.Literate_01", "utils.util_pydantic"]
+MODEL_DOC_PATH = f"{ldm_dull_specs['models_dir']}/Mini/Mini.md"
+
+# none of them named, all of them in what's pickled - or making it
+REACHED_MODULES = [
+    "utils.class_casing",
+    "utils.class_container",
+    "utils.class_pom_token",
+    "utils.util_json",
+    "utils.typed_dict_tools_diff",
+    "ldm.parsedt",
+    "utils.util_emoji",
+]
+
+
+def cache_key() -> str:
+    return parse_cache_key(ldm_dull_specs, MODEL_DOC_PATH, code_modules=CODE_MODULES)
+
+
+def edit_source(monkeypatch, edited_module: str):
+    original_source = dull_parse_cache.module_source
+
+    def module_source(module_name: str) -> bytes:
+        source = original_source(module_name)
+        return source + b"\n# edited\n" if module_name == edited_module else source
+
+    monkeypatch.setattr(dull_parse_cache, "module_source", module_source)
+
+
+def test_modules_used_reaches_what_the_model_is_built_from():
+    used = modules_used(set(PARSER_MODULES) | set(CODE_MODULES))
+    assert set(REACHED_MODULES) <= used
+
+
+@pytest.mark.parametrize("edited_module", REACHED_MODULES)
+def test_key_changes_with_a_module_reached_through_others(monkeypatch, edited_module):
+    before = cache_key()
+    edit_source(monkeypatch, edited_module)
+    assert cache_key() != before
+
+
+def test_key_ignores_modules_the_parse_does_not_use(monkeypatch):
+    before = cache_key()
+    edit_source(monkeypatch, ldm.do_check_includes.__name__)
+    assert cache_key() == before
+
+
+def test_key_changes_with_compact_tokens(monkeypatch):
+    before = cache_key()
+    monkeypatch.setattr(dull_parse_cache, "COMPACT_TOKENS", not dull_parse_cache.COMPACT_TOKENS)
+    assert cache_key() != before
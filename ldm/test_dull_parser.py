@@ -0,0 +1,95 @@
+"""
+The parser's shortcuts against the long way round:
+- the LineClassifier against a scan of the clause specs in priority order
+- an incremental reparse against a full parse of the edited document
+
+Run from the project root, as the builds are.
+"""
+
+import json
+
+import pytest
+
+from ldm.do_build_ldm import ldm_dull_specs
+from dull_dsl.dull_parser import parse_model_doc, parse_model_doc_incrementally
+from dull_dsl.dull_parser_classes import PreviousParses, line_classifier_for
+from utils.util_emoji import might_have_emoji, strip_emoji
+from utils.util_fmk import read_lines, write_text
+
+MODEL_NAMES = ["Literate", "LiterateTester", "Markdown", "Diagrams", "Mini"]
+
+
+def model_doc_path(model_name: str) -> str:
+    return f"{ldm_dull_specs['models_dir']}/{model_name}/{model_name}.md"
+
+
+def bare(line: str) -> str:
+    """The line as assess_line() hands it to the classifier."""
+    trimmed = line.strip()
+    return strip_emoji(trimmed) if might_have_emoji(trimmed) else trimmed
+
+
+def scanned(line_types, trimmed: str):
+    """The first clause spec, by priority, that matches - as the parser found it before the LineClassifier."""
+    for line_type in line_types:
+        if line_type.matches(trimmed):
+            return line_type
+    return None
+
+
+@pytest.mark.parametrize("model_name", MODEL_NAMES)
+def test_line_classifier_matches_priority_scan(model_name):
+    line_types = ldm_dull_specs["all_clauses_by_priority"]
+    classifier = line_classifier_for(line_types)
+    for line in read_lines(model_doc_path(model_name)):
+        trimmed = bare(line)
+        if trimmed:
+            assert classifier.classify(trimmed) is scanned(line_types, trimmed), trimmed
+
+
+def derived_text(doc_part) -> str:
+    """The document's dict, as text - or how deriving it failed, which should be the same too."""
+    try:
+        return json.dumps(doc_part.derive_dict_for_document(ldm_dull_specs), default=str)
+    except Exception as e:
+        return f"failed: {type(e).__name__}"
+
+
+def edit_a_line(lines):
+    k = next(k for k in range(len(lines) // 2, len(lines)) if lines[k].strip() and not lines[k].startswith("#"))
+    return lines[:k] + [lines[k] + " (edited)"] + lines[k + 1:]
+
+
+def last_header(lines) -> int:
+    return max(k for k, line in enumerate(lines) if line.startswith("#"))
+
+
+def insert_a_line(lines):
+    k = last_header(lines)
+    return lines[: k + 1] + ["A line put in after a header."] + lines[k + 1:]
+
+
+def delete_a_header(lines):
+    k = last_header(lines)
+    return lines[:k] + lines[k + 1:]
+
+
+@pytest.mark.parametrize("model_name", ["Literate", "Mini"])
+@pytest.mark.parametrize("edit", [edit_a_line, insert_a_line, delete_a_header], ids=lambda edit: edit.__name__)
+def test_incremental_reparse_matches_full_parse(tmp_path, model_name, edit):
+    lines = read_lines(model_doc_path(model_name))
+    doc_path = str(tmp_path / f"{model_name}.md")
+    previous_parses = PreviousParses()
+
+    write_text(doc_path, "\n".join(lines) + "\n")
+    first = parse_model_doc_incrementally(ldm_dull_specs, doc_path, previous_parses)
+    derived_text(first)  # as a build would: the reused parts bring their dicts along
+
+    write_text(doc_path, "\n".join(edit(lines)) + "\n")
+    reparsed = parse_model_doc_incrementally(ldm_dull_specs, doc_path, previous_parses)
+    reparsed_tree = reparsed.displayed()
+    reparsed_dict = derived_text(reparsed)
+
+    full = parse_model_doc(ldm_dull_specs, doc_path, processes=0)
+    assert reparsed_tree == full.displayed()
+    assert reparsed_dict == derived_text(full)
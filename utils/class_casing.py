@@ -24,17 +24,40 @@ The init should also handle UpperCamel(SnakeCase("xxx"), ...)
 from __future__ import annotations
 
 import re
+import sys
 import json
+import collections
 
 
 
 from dataclasses import InitVar
 
-from typing import List, Any
+from typing import List, Any, Tuple
 
 from utils.class_pom_token import PresentableToken
 from utils.class_templates import PomTemplate
-from utils.util_pydantic import dataclass, field
+from utils.util_pydantic import dataclass, field, COMPACT_TOKENS
+
+WORD_SEPARATOR_PATTERN = re.compile(r"[-_.\s]")  # spaces, -,_ and .
+CAMEL_WORD_PATTERN = re.compile(r"[A-Z]?[a-z]+|[A-Z]+(?=[A-Z]|$)")
+
+# Casings already worked out: (casing class, as entered) -> (words, content).
+# The same names are made over and over - a ClassReference for each mention
+# of a class, SnakeCase keys while deriving - so after the first, it's a lookup.
+# The contents are interned, so equal names share the one string.
+# Least recently used casings are dropped first: a hit moves its key to the end.
+CASING_CACHE_SIZE = 16384
+casings: collections.OrderedDict[Tuple[type, str], Tuple[Tuple[str, ...], str]] = collections.OrderedDict()
+
+
+def remember_casing(key: Tuple[type, str], words: List[str], content: str) -> str:
+    """Caches the casing under key (dropping the least recently used if full); returns the interned content."""
+    if type(content) is str:
+        content = sys.intern(content)
+    if len(casings) >= CASING_CACHE_SIZE:
+        casings.popitem(last=False)
+    casings[key] = (tuple(words), content)
+    return content
 
 
 
@@ -54,8 +77,32 @@ class Casing(PresentableToken):     # Note. PresentableToken now includes Pydant
         # if isinstance(self.content, list):
         #     self.content = " ".join(str(item) for item in self.content)
         self.as_entered = self.content
-        self.words = self.split_to_words(self.as_entered)
+
+        cacheable = type(self.as_entered) is str
+        key = (type(self), self.as_entered)
+        cached = casings.get(key) if cacheable else None
+        if cached is not None:
+            casings.move_to_end(key)
+            (words, self.content) = cached
+            if not COMPACT_TOKENS:
+                self.words = list(words)
+            return
+
+        if not COMPACT_TOKENS:
+            self.words = self.split_to_words(self.as_entered)
         self.content = self.convert()
+        if cacheable:
+            self.content = remember_casing(key, self.words, self.content)
+
+    if COMPACT_TOKENS:
+        # not kept: worked out from as_entered when wanted
+        @property
+        def words(self) -> List[str]:
+            if type(self.as_entered) is str:
+                cached = casings.get((type(self), self.as_entered))
+                if cached is not None:
+                    return list(cached[0])
+            return self.split_to_words(self.as_entered)
 
 
     def value(self) -> str:
@@ -82,7 +129,7 @@ class Casing(PresentableToken):     # Note. PresentableToken now includes Pydant
         Returns:
             _type_: _description_
         """
-        words1 = re.split(r"[-_.\s]", input_string)  # split on spaces,  -,_ and .
+        words1 = WORD_SEPARATOR_PATTERN.split(input_string)  # split on spaces,  -,_ and .
         words2 = [word for word in words1 if word]  # remove empty strings
         #  split all camel case words, combine into flat list
         words3 = [
@@ -99,7 +146,7 @@ class Casing(PresentableToken):     # Note. PresentableToken now includes Pydant
         """
         Split a CamelCase string into words.
         """
-        return re.findall(r"[A-Z]?[a-z]+|[A-Z]+(?=[A-Z]|$)", input_string)
+        return CAMEL_WORD_PATTERN.findall(input_string)
 
 
     def convert(self):
@@ -1,11 +1,18 @@
-import warnings
-from typing import Any, Type, List, Optional
-from utils.util_pydantic import PydanticMixin,  dataclass, field
+import os
+from typing import Any, Dict, Tuple, Type, List, Optional
+from utils.util_pydantic import PydanticMixin,  dataclass, field, COMPACT_TOKENS
 from utils.util_fmk import id_for, ids_for
+from dataclasses import MISSING
+
+# LITERATE_REPORT_MISMATCHES=1 in the environment prints each match made only
+# by class name, between classes from different modules, the first time it's made
+REPORT_MODULE_MISMATCHES = os.environ.get("LITERATE_REPORT_MISMATCHES") == "1"
 
 @dataclass 
 class Container():
     container: Optional["Container"]  = None
+    if COMPACT_TOKENS:
+        __slots__ = ()  # so compact subclasses (ClassReference, ...) don't get a __dict__ from here
     # container: Optional["Container"] = field(default=None, kw_only=True)
     
     def shared_post_init(self):
@@ -21,7 +28,66 @@ class Container():
         cleaned = [c for c in containees0 if c and is_robust_instance(c, Container)]
         return cleaned
     
-    def set_containees_back(self, parents = [], verbose = False):
+    def set_containees_back(self, verbose = False, registry = MISSING):
+        """Sets the container of everything under this one. attach() does it for just a new part."""
+        if registry is MISSING:
+            # the registry of the tree this is in, if it's kept one
+            registry = getattr(self.root(), "contained_p", None)
+        self.set_back_below([], set(), verbose, registry)
+
+    def attach(self, child: "Container", verbose = False):
+        """
+        child has just been put in one of this one's fields or lists: sets its
+        container, and those of what's under it, leaving the rest of the tree be.
+        """
+        if not child or not is_robust_instance(child, Container):
+            print(f"CBUG: Can't attach {type(child)} to {type(self)}; it's not a Container")
+            return
+        parents = self.containers_above() + [self]
+        parent_ids = {id(p) for p in parents}
+        if id(child) in parent_ids:
+            parents_list = [id_for(p) for p in parents]
+            print(f"CBUG: ContainmentCycle: !!! Can't contain {child} in {self}; it's among the parents: {parents_list}")
+            return
+        registry = getattr(parents[0], "contained_p", None)
+        self.note_ancestry()
+        self.adopt(child, registry, verbose)
+        child.set_back_below(parents, parent_ids, verbose, registry)
+
+    def detach(self, child: "Container"):
+        """
+        child has just been taken out of one of this one's fields or lists: takes
+        it, and what's under it, out of the tree's registry. It's a root of its own
+        after; attach() puts it back in a tree.
+        """
+        if not child or not is_robust_instance(child, Container) or child.container is not self:
+            return
+        registry = getattr(self.root(), "contained_p", None)
+        if registry is not None:
+            registry.discard(child)
+            for below in child.walk_contained(Container):
+                registry.discard(below)
+        child.container = None
+
+    def set_contained(self, field_name: str, value):
+        """
+        Puts value - a Container, or a list of them - in the field, in place of
+        what's there: what's gone is detached, and what's new attached.
+        """
+        old_value = getattr(self, field_name, None)
+        setattr(self, field_name, value)
+        old_items = old_value if isinstance(old_value, list) else [old_value]
+        new_items = value if isinstance(value, list) else [value]
+        kept = {id(item) for item in new_items}
+        for item in old_items:
+            if item is not None and id(item) not in kept:
+                self.detach(item)
+        for item in new_items:
+            if item is not None:
+                self.attach(item)
+
+    def set_back_below(self, parents: List["Container"], parent_ids: set, verbose: bool, registry):
+        """parents are the containers above this one, as far as the set-back started; parent_ids, their ids."""
         if not self:
             print("CBUG: None parent in set_containees back; skipping set-backs")
             return
@@ -29,7 +95,13 @@ class Container():
             print("CBUG: NonContainer parent in set_containees back; skipping set-backs")
             print(f"\t{type(self)} [{self}]")
             return 
-        for c in self.clean_containees():
+        containees = self.clean_containees()
+        if containees:
+            # (re)noted on the way down, so moved containees get the ancestry of their new place
+            self.note_ancestry()
+        parents.append(self)
+        parent_ids.add(id(self))
+        for c in containees:
             if not c:
                 print(f"CBUG: Null containee inside {type(self)}")
                 continue
@@ -37,22 +109,70 @@ class Container():
                 print(f"CBUG: Containee {type(c)} for {type(self)} is not a Container")
                 print("***   ", self, "   ***")
                 continue
-            if c in parents:
+            if id(c) in parent_ids:
                 parents_list = [id_for(p) for p in parents]
                 print(f"CBUG: ContainmentCycle: !!! Can't contain {c} in {self}; it's among the parents: {parents_list}")
                 continue
-            if verbose:
-                print(f"Setting container of {id_for(c)} to {id_for(self)}")
-            c.container = self
-            c.set_containees_back(parents + [self], verbose=verbose)
-        
+            self.adopt(c, registry, verbose)
+            c.set_back_below(parents, parent_ids, verbose, registry)
+        parents.pop()
+        parent_ids.discard(id(self))
+
+    def adopt(self, c: "Container", registry, verbose: bool):
+        if verbose:
+            print(f"Setting container of {id_for(c)} to {id_for(self)}")
+        if c.container is not None and c.container is not self:
+            forget_moved(c, registry)
+        elif c.container is None and getattr(c, "contained_p", None) is not None:
+            del c.contained_p  # no longer a root; its tree's registry is the one above
+        c.container = self
+        if registry is not None:
+            registry.add(c)
+
     
+    def note_ancestry(self) -> Optional[Dict[str, "Container"]]:
+        """
+        The nearest container of each type above this one's containees (this
+        one included), keyed on the class name - as is_robust_instance matches
+        them. All the containees share it, as ancestry_p.
+        None if there's something other than a Container above.
+        """
+        parent = self.container
+        if parent is None:
+            ancestry = {}
+        elif is_robust_instance(parent, Container):
+            above = parent.ancestry()
+            ancestry = dict(above) if above is not None else None
+        else:
+            ancestry = None
+
+        if ancestry is not None:
+            for base in type(self).__mro__:
+                ancestry[base.__name__] = self
+        try:
+            self.ancestry_p = ancestry
+        except AttributeError:
+            pass  # compact tokens have no room for it; they've no containees anyway
+        return ancestry
+
+    def ancestry(self) -> Optional[Dict[str, "Container"]]:
+        ancestry = getattr(self, "ancestry_p", MISSING)
+        if ancestry is MISSING:
+            ancestry = self.note_ancestry()
+        return ancestry
+
     # Updated containing method using the robust checker
     def containing(self, ctype: Type) -> 'Container':
         """Find the nearest container of the specified type."""
         if not self.container:
             return None
-        
+
+        if isinstance(self.container, Container):
+            ancestry = self.container.ancestry()
+            if ancestry is not None:
+                return ancestry.get(ctype.__name__)
+
+        # not all Containers above: walk up, reporting what's there
         if is_robust_instance(self.container, ctype):
             return self.container
         # print("Trying selfcontainer: a ...", type(self), " contained in ", type(self.container))
@@ -61,7 +181,52 @@ class Container():
             return None
         return self.container.containing(ctype)
     
+    def root(self) -> "Container":
+        top = self
+        while is_robust_instance(top.container, Container):
+            top = top.container
+        return top
+
+    def containers_above(self) -> List["Container"]:
+        """From the root down to this one's container."""
+        above = []
+        parent = self.container
+        while is_robust_instance(parent, Container):
+            above.append(parent)
+            parent = parent.container
+        above.reverse()
+        return above
+
     def all_contained(self, ctype: Type) -> List["Container"]:
+        """
+        Everything under this one of type ctype. On a root, from its registry:
+        in the order they were attached - walk_contained()'s order for what was
+        set back in one go, with what's been attached since coming after.
+        """
+        if self.container is None:
+            registry = self.contained_registry()
+            if registry is not None:
+                return registry.of_type(ctype)
+        return self.walk_contained(ctype)
+
+    def contained_registry(self) -> Optional["ContainedRegistry"]:
+        """
+        For a root (a LiterateModel, say): the registry of what's under it,
+        made by one walk the first time it's asked for, then kept up by
+        set_containees_back.
+        """
+        registry = getattr(self, "contained_p", None)
+        if registry is None:
+            registry = ContainedRegistry()
+            for c in self.walk_contained(Container):
+                registry.add(c)
+            try:
+                self.contained_p = registry
+            except AttributeError:
+                return None  # compact tokens have no room for it
+        return registry
+
+    def walk_contained(self, ctype: Type) -> List["Container"]:
         the_list = []
         
         for c in self.clean_containees():
@@ -70,7 +235,7 @@ class Container():
             
             if is_robust_instance(c, ctype):
                 the_list.append(c)
-            the_list.extend(c.all_contained(ctype))
+            the_list.extend(c.walk_contained(ctype))
         return the_list
 
     def up_chain(self):
@@ -86,6 +251,70 @@ class Container():
         
         return  chain + " -> " + parent.up_chain()
 
+class ContainedRegistry:
+    """
+    The containers under a root, by their concrete type, in the order they
+    were attached - so all_contained() on the root is a lookup of the types
+    that match, not a walk of the tree.
+
+    set_containees_back and attach add what they attach, and take out anything
+    moved in from another tree; detach (and set_contained, for what it
+    replaces) takes out what's taken out of the tree. So whatever changes a
+    tree's containees after it's set back goes through those: something just
+    put in a field isn't contained yet (its container is None), so isn't here
+    either; something just taken out would still be. Each container is here
+    once, where walk_contained() would list one that's in two places twice.
+    """
+
+    def __init__(self):
+        self.by_type: Dict[type, Dict[int, Container]] = {}
+        self.order: Dict[int, int] = {}  # id(container) -> when it was added
+
+    def add(self, c: Container):
+        if id(c) in self.order:
+            return
+        self.order[id(c)] = len(self.order)
+        self.by_type.setdefault(type(c), {})[id(c)] = c
+
+    def discard(self, c: Container):
+        if self.order.pop(id(c), None) is not None:
+            del self.by_type[type(c)][id(c)]
+
+    def of_type(self, ctype: Type) -> List[Container]:
+        target_name = ctype.__name__
+        matching = [
+            instances
+            for (concrete, instances) in self.by_type.items()
+            if instances and any(base.__name__ == target_name for base in concrete.__mro__)
+        ]
+        if len(matching) == 1:
+            return list(matching[0].values())
+        found = [c for instances in matching for c in instances.values()]
+        return sorted(found, key=lambda c: self.order[id(c)])
+
+    # ids don't survive pickling (the parse cache keeps models); the containers do
+    def __getstate__(self):
+        return sorted(
+            (c for instances in self.by_type.values() for c in instances.values()),
+            key=lambda c: self.order[id(c)],
+        )
+
+    def __setstate__(self, state):
+        self.__init__()
+        for c in state:
+            self.add(c)
+
+
+def forget_moved(c: Container, registry: Optional[ContainedRegistry]):
+    """c (and what's under it) is moving; take it out of the registry of the tree it was in."""
+    old_registry = getattr(c.container.root(), "contained_p", None) if is_robust_instance(c.container, Container) else None
+    if old_registry is None or old_registry is registry:
+        return
+    old_registry.discard(c)
+    for below in c.walk_contained(Container):
+        old_registry.discard(below)
+
+
 def show_containers(container: Container, indent = ""):
     for c in container.clean_containees():
         if not c:
@@ -93,6 +322,13 @@ def show_containers(container: Container, indent = ""):
         print(f"{indent}{id_for(container)} contains {id_for(c)}")
         show_containers(c, indent + "\t")
 
+# (type(obj), ctype) -> is_robust_instance's answer, which depends only on the types
+robust_matches: Dict[Tuple[type, Type], bool] = {}
+
+# (found class, expected class) for each match made only by name across modules
+module_mismatches: Dict[Tuple[str, str], None] = {}
+
+
 def is_robust_instance(obj: Any, ctype: Type) -> bool:
     """
     Check if obj is an instance of ctype, handling module import differences.
@@ -104,9 +340,25 @@ def is_robust_instance(obj: Any, ctype: Type) -> bool:
     Returns:
         bool: True if obj is an instance of ctype (or equivalent class)
         
-    Warns:
-        If module path differences are detected and fallback matching is used
+    The answer for each pair of types is worked out once, by robust_match,
+    and remembered in robust_matches.
     """
+    if isinstance(obj, ctype):
+        return True  # the usual case, and quicker than the lookup
+    key = (type(obj), ctype)
+    try:
+        return robust_matches[key]
+    except KeyError:
+        pass
+    except TypeError:
+        return robust_match(obj, ctype)  # an unhashable ctype
+
+    matched = robust_match(obj, ctype)
+    robust_matches[key] = matched
+    return matched
+
+
+def robust_match(obj: Any, ctype: Type) -> bool:
     # First try the standard isinstance check
     if isinstance(obj, ctype):
         return True
@@ -117,43 +369,34 @@ def is_robust_instance(obj: Any, ctype: Type) -> bool:
     
     # Check direct class name match
     if obj_class.__name__ == target_name:
-        # Warn about module path mismatch
-        obj_module = getattr(obj_class, '__module__', 'unknown')
-        ctype_module = getattr(ctype, '__module__', 'unknown')
-        
-        if obj_module != ctype_module and False:
-            warnings.warn(
-                f"Module path mismatch detected: "
-                f"object class {obj_class.__name__} from '{obj_module}' "
-                f"vs expected class from '{ctype_module}'. "
-                f"This suggests inconsistent imports. "
-                f"Consider standardizing your import statements.",
-                UserWarning,
-                stacklevel=2
-            )
-        
+        note_module_mismatch(obj_class, ctype)
         return True
     
     # Check inheritance chain for name matches
     for base in obj_class.__mro__:
         if base.__name__ == target_name:
-            # Warn about module path mismatch in inheritance
-            base_module = getattr(base, '__module__', 'unknown')
-            ctype_module = getattr(ctype, '__module__', 'unknown')
-            
-            # if base_module != ctype_module:
-            #     warnings.warn(
-            #         f"Module path mismatch in inheritance: "
-            #         f"object inherits from {base.__name__} in '{base_module}' "
-            #         f"vs expected class from '{ctype_module}'. "
-            #         f"This suggests inconsistent imports.",
-            #         UserWarning,
-            #         stacklevel=2
-            #     )
-            
+            note_module_mismatch(base, ctype)
             return True
     
     return False
+
+
+def note_module_mismatch(found: type, expected: type):
+    """
+    Notes a match made only by name; it's a real mismatch (inconsistent
+    imports) if the classes are from different modules. Reported the first
+    time, if REPORT_MODULE_MISMATCHES.
+    """
+    found_module = getattr(found, '__module__', 'unknown')
+    expected_module = getattr(expected, '__module__', 'unknown')
+    if found_module == expected_module:
+        return
+    key = (f"{found_module}.{found.__qualname__}", f"{expected_module}.{expected.__qualname__}")
+    if key in module_mismatches:
+        return
+    module_mismatches[key] = None
+    if REPORT_MODULE_MISMATCHES:
+        print(f"Module path mismatch: {key[0]} taken for {key[1]}; this suggests inconsistent imports")
 # Optional: Helper function to detect and report all import inconsistencies
 def check_import_consistency(*classes):
     """
@@ -1,4 +1,4 @@
-from typing import Dict, Callable, Any, Type
+from typing import Dict, Callable, Any, Optional, Set, Tuple, Type
 import sys
 from functools import wraps
 import inspect
@@ -38,7 +38,12 @@ def show_patches(patches):
             print(f"Function {func.__name__} registered as {method_name} for target {target}")
 
 class Faculty:
-    """Base class for faculty objects that manage method patching."""
+    """Base class for faculty objects that manage method patching.
+
+    A faculty has the patches registered by the time it's made (and any
+    added with register_patch). What it resolves for each type is remembered
+    in dispatch_cache and super_chains, which register_patch clears.
+    """
     
     def __init__(self):
         # Set up patches from global registry when instance is created
@@ -49,12 +54,31 @@ class Faculty:
             if class_name not in self.all_patches:
                 self.all_patches[class_name] = {}
             self.all_patches[class_name].update(methods)
+
+        # (type, method_name, current_class_name) -> the patched function resolved, or None
+        self.dispatch_cache: Dict[Tuple[Type, str, Optional[str]], Optional[Callable]] = {}
+        # (type, method_name) -> {code of each patched function along the MRO: its class name}
+        self.super_chains: Dict[Tuple[Type, str], Dict[Any, str]] = {}
+        # code of the faculty's own plumbing (call_super_validate, ...), which callers go
+        # through - not the patches, which may be defined in the faculty's class body too
+        self.helper_codes: Set[Any] = {
+            value.__code__
+            for klass in type(self).__mro__
+            for value in vars(klass).values()
+            if inspect.isfunction(value) and not hasattr(value, "_patch_target")
+        }
         
         # print("Faculty patches setup:")
         # for target, methods in self.all_patches.items():
         #     for method_name, func in methods.items():
         #         print(f"  {target}.{method_name} -> {func.__name__}")
         
+    def register_patch(self, class_name: str, method_name: str, func: Callable):
+        """Adds (or replaces) a patch on this faculty after it's made."""
+        self.all_patches.setdefault(class_name, {})[method_name] = func
+        self.dispatch_cache.clear()
+        self.super_chains.clear()
+
     def resolve_patched_method(self, obj, method_name: str, current_class_name: str = None):
         """Resolve the appropriate patched method for an object.
         
@@ -63,11 +87,19 @@ class Faculty:
             method_name: Name of the method to find
             current_class_name: Optional current class name for super() calls
         """
-        otype = getattr(obj, "_type", "No type?")
-        oname = getattr(obj, "name", "NoName?")
-        actual_type = type(obj).__name__
-        
-        cls = type(obj)
+        key = (type(obj), method_name, current_class_name)
+        try:
+            patched_func = self.dispatch_cache[key]
+        except KeyError:
+            patched_func = self.find_patched_method(type(obj), method_name, current_class_name)
+            self.dispatch_cache[key] = patched_func
+            return patched_func
+
+        if patched_func is None:
+            self.report_missing(type(obj), method_name, current_class_name)
+        return patched_func
+
+    def find_patched_method(self, cls: Type, method_name: str, current_class_name: str = None):
         mro = [c.__name__ for c in cls.__mro__]
         
         current_index = -1
@@ -86,12 +118,14 @@ class Faculty:
                 # print(f"Found {method_name} method: {patched_func} on class: {class_name}")
                 return patched_func
         
+        self.report_missing(cls, method_name, current_class_name)
+        return None
+
+    def report_missing(self, cls: Type, method_name: str, current_class_name: str = None):
         if current_class_name:
             print(f"No parent {method_name} method found after {current_class_name}")
         else:
-            print(f"No {method_name} method found for {actual_type}")
-        
-        return None
+            print(f"No {method_name} method found for {cls.__name__}")
     
     def call_super_method(self, obj, method_name: str, current_class_name: str = None):
         """Helper to call the next method in the MRO.
@@ -105,32 +139,50 @@ class Faculty:
         if current_class_name is None:
             # Get the calling frame to determine current class
             frame = inspect.currentframe().f_back
-            # Look for the method name in the frame's local variables or code
-            current_class_name = self._detect_current_class(frame, obj)
+            current_class_name = self._detect_current_class(frame, obj, method_name)
         
         patched_func = self.resolve_patched_method(obj, method_name, current_class_name)
         if patched_func:
             return patched_func(obj)
         return None
     
-    def _detect_current_class(self, frame, obj):
-        """Attempt to detect the current class from the call stack."""
-        # This is a bit tricky - we'll use the MRO and try to match against registered methods
-        cls = type(obj)
-        mro = [c.__name__ for c in cls.__mro__]
-        
-        # Get the function name from the frame
-        func_code = frame.f_code
-        func_name = func_code.co_name
-        
-        # Look through MRO to find which class this function belongs to
-        for class_name in mro:
-            class_methods = self.all_patches.get(class_name, {})
-            if func_name in [f.__name__ for f in class_methods.values()]:
+    def super_chain(self, cls: Type, method_name: str) -> Dict[Any, str]:
+        """
+        The code of each method_name patch along cls's MRO, and the class it's
+        on - first found, nearest. A wrapped patch is there by the code of the
+        function it wraps, too.
+        """
+        key = (cls, method_name)
+        chain = self.super_chains.get(key)
+        if chain is None:
+            chain = {}
+            for c in cls.__mro__:
+                patched_func = self.all_patches.get(c.__name__, {}).get(method_name)
+                if patched_func is not None:
+                    chain.setdefault(patched_func.__code__, c.__name__)
+                    chain.setdefault(inspect.unwrap(patched_func).__code__, c.__name__)
+            self.super_chains[key] = chain
+        return chain
+
+    def _detect_current_class(self, frame, obj, method_name: str):
+        """
+        Detect the current class from the caller: the class of the method_name
+        patch on obj's type that made the call - directly or through the
+        faculty's own helpers, like call_super_validate. Nothing further up the
+        stack is looked at; if the caller isn't a patch, pass the class name.
+        """
+        chain = self.super_chain(type(obj), method_name)
+        caller = frame
+        while caller is not None:
+            class_name = chain.get(caller.f_code)
+            if class_name:
                 print(f"Auto-detected current class: {class_name}")
                 return class_name
+            if caller.f_code not in self.helper_codes:
+                break
+            caller = caller.f_back
         
-        print(f"Could not auto-detect current class for {func_name}")
+        print(f"Could not auto-detect current class for {(caller or frame).f_code.co_name}")
         return None
 
 def faculty_class(cls):
@@ -0,0 +1,85 @@
+"""
+The indexes a LiterateModel keeps of its classes - by name, by plural and
+both, and by subject (the classes in each and the subjects below it) - with
+the version of the model they're up to date with.
+
+Whatever changes the model after it's built (validation adding implied
+attributes, subtypings, dependents...) calls model.model_changed(), which
+bumps the version. The indexes catch up when next used: the classes noted as
+changed are looked at again, and only if one's name or plural is different
+(or classes came or went) are they built again.
+
+A class here is anything with a name and a derive_plural(); a subject (or the
+model), anything with classes and, maybe, subjects.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class ClassIndexes:
+    def __init__(self, model):
+        self.model = model
+        self.version = 0
+        self.built_version = None
+        self.changed_classes: List[Any] = []
+        self.structure_changed = True
+
+        self.classes: List[Any] = []
+        self.keys: Dict[int, Tuple[str, str]] = {}  # id(class) -> (name, plural), as they were indexed
+        self.by_name: Dict[str, Any] = {}
+        self.by_plural: Dict[str, Any] = {}
+        self.full: Dict[str, Any] = {}
+        self.by_subject: Dict[int, Tuple[Any, List[Any]]] = {}  # id(subject) -> (subject, its classes)
+
+    def note_change(self, changed=None):
+        """changed is the class that changed, or None if classes came or went."""
+        self.version += 1
+        if changed is None:
+            self.structure_changed = True
+        else:
+            self.changed_classes.append(changed)
+
+    def current(self) -> "ClassIndexes":
+        if self.built_version != self.version:
+            self.catch_up()
+        return self
+
+    def catch_up(self):
+        if not self.structure_changed:
+            for cls in self.changed_classes:
+                if self.keys.get(id(cls)) != index_keys(cls):
+                    self.structure_changed = True
+                    break
+        if self.structure_changed:
+            self.rebuild()
+        self.changed_classes = []
+        self.structure_changed = False
+        self.built_version = self.version
+
+    def subject_classes(self, subject) -> Optional[List[Any]]:
+        """The classes in subject and the subjects below it; None if it's not in the model."""
+        (indexed, classes) = self.by_subject.get(id(subject), (None, None))
+        return classes if indexed is subject else None
+
+    def rebuild(self):
+        self.by_subject = {}
+        self.classes = self.collect_classes(self.model)
+        self.by_name = {str(c.name): c for c in self.classes}
+        if None in self.by_name:
+            print("Found none in singular index")
+        self.by_plural = {c.derive_plural(): c for c in self.classes}
+        if None in self.by_plural:
+            print("Found none in p;ural index")
+        self.full = self.by_name | self.by_plural
+        self.keys = {id(c): index_keys(c) for c in self.classes}
+
+    def collect_classes(self, subject) -> List[Any]:
+        classes = list(subject.classes)
+        for below in getattr(subject, "subjects", None) or []:
+            classes.extend(self.collect_classes(below))
+        self.by_subject[id(subject)] = (subject, classes)
+        return classes
+
+
+def index_keys(cls) -> Tuple[str, str]:
+    return (str(cls.name), cls.derive_plural())
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from utils.util_pydantic import PydanticMixin,  dataclass, field
+from utils.util_pydantic import PydanticMixin,  dataclass, field, COMPACT_TOKENS
 
 from typing import Any, Union
 
@@ -28,6 +28,10 @@ class PresentableToken(PydanticMixin):
     
     __field_order__ = ["_type", "content"]
 
+    # in compact mode: slots, not a __dict__, for the fields and these
+    __compact__ = True
+    __compact_slots__ = ("as_entered",)
+
 
     def shared_post_init(self):
         super().shared_post_init()
@@ -117,16 +121,19 @@ class PresentableBoolean(PresentableToken):
         if self.true_word is None or self.false_word is None:
             raise NotImplementedError("Subclasses of PresentableBoolean must define true_word and false_word")
 
+        # these are the same for every instance; in compact mode they're kept on the class
+        holder = type(self) if COMPACT_TOKENS else self
+
         # Initialize words lists if not already set
         # always accept true/yes, false/no
         if self.true_words is None:
-            self.true_words = [self.true_word.lower(), "true", "yes"]
+            holder.true_words = [self.true_word.lower(), "true", "yes"]
         if self.false_words is None:
-            self.false_words = [self.false_word.lower(), "false", "no"]
+            holder.false_words = [self.false_word.lower(), "false", "no"]
 
         # Generate the token pattern
         all_words = [f'"{word}"i' for word in self.true_words + self.false_words]
-        self.token_pattern_str = " | ".join(all_words)
+        holder.token_pattern_str = " | ".join(all_words)
         
         # above should be done for class definition?
         
@@ -312,6 +319,7 @@ import emoji
 @dataclass
 class Emoji(PresentableToken):
     as_entered: str = field(default="", init=True)
+    __compact_slots__ = ("shortcode", "symbol")
 
     token_pattern_str = r"/\d+(.*?)[\u263a-\U0001f645]/"
     # regex = re.compile(r'\d+(.*?)[\u263a-\U0001f645]')
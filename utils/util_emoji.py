@@ -0,0 +1,37 @@
+"""
+Emoji helpers with a fast path for plain text.
+
+Nearly all model lines are plain ASCII, so before handing a line to the
+emoji package we check for any codepoint that could be part of an emoji.
+Only © and ® sit below U+2000 (keycaps like 1️⃣ carry U+20E3), so lines
+without those or anything above U+2000 can't contain an emoji.
+
+The emoji package is only imported once a line needs it.
+"""
+
+import re
+from typing import Dict, List
+
+MAYBE_EMOJI = re.compile("[\u00a9\u00ae\u2000-\U0010ffff]")
+
+
+def might_have_emoji(text: str) -> bool:
+    return MAYBE_EMOJI.search(text) is not None
+
+
+def emoji_list(text: str) -> List[Dict]:
+    """Same as emoji.emoji_list(), but [] without a lookup for plain text."""
+    if not MAYBE_EMOJI.search(text):
+        return []
+    import emoji
+
+    return emoji.emoji_list(text)
+
+
+def strip_emoji(text: str) -> str:
+    """The text without its emojis (and stripped), or just stripped if there are none."""
+    if not MAYBE_EMOJI.search(text):
+        return text.strip()
+    import emoji
+
+    return emoji.replace_emoji(text, "").strip()
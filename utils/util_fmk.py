@@ -20,6 +20,14 @@ def write_text(file, text):
         f.write(text)
 
 
+def open_text(file):
+    """
+    Opens a text file (UTF-8 encoded) for writing piece by piece.
+    """
+    insure_home_for(file)
+    return open(file, mode="w", encoding="utf-8")
+
+
 def read_text(path: str) -> str:
     with open(path, "r", encoding="utf-8") as file:
         data = file.read()
@@ -32,6 +40,17 @@ def read_lines(path: str) -> str:
     return data.split("\n")
 
 
+def iter_lines(path: str):
+    """Same lines as read_lines(), but read lazily - for very large files."""
+    last = ""
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            last = line
+            yield line.removesuffix("\n")
+    if last.endswith("\n") or not last:
+        yield ""  # as data.split() gives after a final newline
+
+
 def glob_files(*file_list):
     """Processes a list of files using glob."""
     all_matching_files = []
@@ -1,4 +1,4 @@
-from typing import Dict, Any
+from typing import Dict, Any, Set
 from dataclasses import asdict
 import json
 import yaml
@@ -17,19 +17,23 @@ def update_nested_dict(original, updates):
 
 
 
-def clean_dict(obj, warnings: bool = False):
-    """Convert dataclass instance to dict, excluding None values."""
+def clean_dict(obj, warnings: bool = False, settled: Set[int] = None):
+    """Convert dataclass instance to dict, excluding None values.
+    settled: ids of pieces that are already clean; they're used as is, not walked again.
+    """
     # print("Clean dict, warnings =  ", warnings)
     if isinstance(obj, (str, int, float, bool)):
         return obj
+    elif settled and id(obj) in settled:
+        return obj
     elif not obj:
         return None
     elif isinstance(obj, list):
-        return [clean_dict(item, warnings = warnings) for item in obj if item is not None]
+        return [clean_dict(item, warnings = warnings, settled=settled) for item in obj if item is not None]
     elif isinstance(obj, dict):
             
         new_dict =  {
-            k: clean_dict(v, warnings=warnings)
+            k: clean_dict(v, warnings=warnings, settled=settled)
             for k, v in obj.items()
             if v is not None and not (isinstance(v, (list, dict)) and not v)
         }
@@ -405,4 +409,4 @@ if __name__ == "__main__":
 
     compare_dicts(results_path, model_name)
 
-    
\ No newline at end of file
+    
\ No newline at end of file
@@ -14,8 +14,10 @@ def read_object(object_path) -> Any:
     return {}
     
 
-def validate_to_schema(schema_path = "", object_path = "") -> bool:
-    schema = read_object(schema_path)
+def validate_to_schema(schema_path = "", object_path = "", validator = None) -> bool:
+    """validator: the schema's Draft7Validator, if it's already compiled (see dull_metamodel_cache)"""
+    if validator is None:
+        validator = Draft7Validator(read_object(schema_path))
     print("Schema path is: ", schema_path)
     # print("SCHEMA is")
     # print(schema)
@@ -24,7 +26,6 @@ def validate_to_schema(schema_path = "", object_path = "") -> bool:
 
     obj = read_object(object_path)
 
-    validator = Draft7Validator(schema)
     errors = sorted(validator.iter_errors(obj), key=lambda e: e.path)
     if errors:
         print(len(errors), " validation errors found!")
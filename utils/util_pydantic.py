@@ -35,8 +35,11 @@ Avoid defining your own __post_init__ or @model_validator. This mixin reroutes b
 """
 
 import json
+import os
+import types
 from pydantic import TypeAdapter, model_validator
-from dataclasses import MISSING
+from dataclasses import MISSING, dataclass as std_dataclass, fields
+from typing import Any, Callable, Dict, List, Tuple
 
 
 # Optional dependency, used in gen_schema
@@ -52,6 +55,13 @@ USING_PYDANTIC = True
 
 # print("### USING_PYDANTIC =", USING_PYDANTIC)
 
+# 🔁 Toggle compact mode: classes marked __compact__ (the tokens - names, booleans,
+#    one liners...) get __slots__ instead of a __dict__, which matters when a model has
+#    hundreds of thousands of them.  It has to be set before the model classes are
+#    defined, so LITERATE_COMPACT_TOKENS=1 in the environment turns it on too.
+COMPACT_TOKENS = False
+COMPACT_TOKENS = COMPACT_TOKENS or os.environ.get("LITERATE_COMPACT_TOKENS") == "1"
+
 # 🔁 Dynamically choose which dataclass/field to use
 if USING_PYDANTIC:
     from pydantic.dataclasses import dataclass as base_dataclass
@@ -82,7 +92,11 @@ def dataclass(*args, **kwargs):
         else:
             kwargs.setdefault("repr", False)
 
+        if COMPACT_TOKENS:
+            restore_inherited_defaults(cls)
         cls = base_dataclass(**kwargs)(cls)
+        if COMPACT_TOKENS and getattr(cls, "__compact__", False):
+            cls = compact_class(cls)
         TYPE_REGISTRY[cls.__name__] = cls
         return cls
 
@@ -92,6 +106,72 @@ def dataclass(*args, **kwargs):
 field = base_field
 
 
+# =============================================================================
+# 🗜 Compact mode: __slots__ for the token classes
+# =============================================================================
+def slot_names(cls) -> List[str]:
+    """The slots of cls and its bases, the bases' first."""
+    return [
+        name
+        for klass in reversed(cls.__mro__)
+        for name in klass.__dict__.get("__slots__", ())
+        if name not in ("__dict__", "__weakref__")
+    ]
+
+
+def restore_inherited_defaults(cls):
+    """
+    A field redeclared without a default (content: Any, in ClassName) takes the one
+    the class inherits.  When the base is compact, what it inherits is a slot,
+    so put the base field's default on cls, as it would have been.
+    """
+    for name in cls.__dict__.get("__annotations__", {}):
+        if name in cls.__dict__ or not isinstance(getattr(cls, name, None), types.MemberDescriptorType):
+            continue
+        for base in cls.__mro__[1:]:
+            base_field = getattr(base, "__dataclass_fields__", {}).get(name)
+            if base_field is not None:
+                if base_field.default is not MISSING:
+                    setattr(cls, name, base_field.default)
+                break
+
+
+def compact_class(cls):
+    """
+    cls made over with __slots__ - for its fields, and for the other attributes
+    its methods set, listed in __compact_slots__ - instead of a __dict__.
+    All its bases need __slots__ too (PydanticMixin and Container have empty ones in compact mode).
+    (dataclass(slots=True) won't take the other attributes, or mend zero-argument super().)
+    """
+    inherited = set(slot_names(cls))
+    field_names = [f.name for f in fields(cls)]
+    own = field_names + list(cls.__dict__.get("__compact_slots__", ()))
+    slots = tuple(name for name in dict.fromkeys(own) if name not in inherited)
+
+    # field defaults live on the class, where they'd hide the slots
+    hidden = set(slots) | set(field_names) | {"__dict__", "__weakref__"}
+    class_dict = {k: v for (k, v) in cls.__dict__.items() if k not in hidden}
+    class_dict["__slots__"] = slots
+    compact_cls = type(cls)(cls.__name__, cls.__bases__, class_dict)
+    compact_cls.__qualname__ = cls.__qualname__
+
+    # zero-argument super() in its methods still means the old class
+    for value in class_dict.values():
+        for func in (value, getattr(value, "__func__", None), getattr(value, "fget", None), getattr(value, "func", None)):
+            code = getattr(func, "__code__", None)
+            if code is None or "__class__" not in code.co_freevars:
+                continue
+            cell = func.__closure__[code.co_freevars.index("__class__")]
+            if cell.cell_contents is cls:
+                cell.cell_contents = compact_cls
+
+    if USING_PYDANTIC:
+        # its validator was built for instances with a __dict__
+        from pydantic.dataclasses import rebuild_dataclass
+        rebuild_dataclass(compact_cls, force=True)
+    return compact_cls
+
+
 # =============================================================================
 # 📦 Main Mixin for compatibility
 # =============================================================================
@@ -107,6 +187,8 @@ def using():
     
 class PydanticMixin():
     _type: str = ""  # auto-set to class name
+    if COMPACT_TOKENS:
+        __slots__ = ()  # so compact subclasses don't get a __dict__ from here
 
     def shared_post_init(self):
         """Override this for shared post-init logic. Use super().shared_post_init()."""
@@ -132,7 +214,13 @@ class PydanticMixin():
 
     def get_field_order(self):
         # print("get_field_order for ", self)   ## TODO - Causes look
-        fieldnames =  getattr(self, "__field_order__", list(self.__dict__.keys()))
+        fieldnames = getattr(self, "__field_order__", None)
+        if fieldnames is None:
+            if hasattr(self, "__dict__"):
+                fieldnames = list(self.__dict__.keys())
+            else:
+                # compact: the slots that have been set
+                fieldnames = [name for name in slot_names(type(self)) if hasattr(self, name)]
         
         ## NOTE: By convention (FMK only) all @properties and @cached_properties end with _p
         ## All these are calculated as needed; none should be serialized
@@ -154,26 +242,17 @@ class PydanticMixin():
 
     
     def to_typed_dict(self):
-        def convert(val):
-            if isinstance(val, PydanticMixin):
-                return val.to_typed_dict()
-            elif isinstance(val, list):
-                return [convert(v) for v in val]
-            elif isinstance(val, dict):
-                
-                return {k: convert(v) for k, v in val.items()}
-            return val
+        """The fields of get_field_order(), as a _type-tagged dict, by way of the serializer for this class."""
         # print(f"{using()} to_typed_dict: {typing_of(self)}")
-        field_names = self.get_field_order()
-        # print(f"\t{typing_of(self)} field names are: ", field_names)
-
-        output = {"_type": getattr(self, "_type", type(self).__name__)}
-        
-        output.update({
-            k: convert(getattr(self, k, None)) for k in self.get_field_order()
-        })
-        
-        return output
+        cls = type(self)
+        serializer = serializers.get(cls)
+        if serializer is None:
+            if hasattr(cls, "__field_order__") or not hasattr(self, "__dict__"):
+                serializer = make_serializer(cls)
+            else:
+                layout = tuple(self.__dict__)
+                serializer = serializers.get((cls, layout)) or make_serializer(cls, layout)
+        return serializer(self)
 
     
     def run_post_init_if_needed(instance):
@@ -188,40 +267,22 @@ class PydanticMixin():
 
     @classmethod
     def from_typed_dict(cls, data):
-        """Recursively deserialize a _type-annotated dict into a dataclass instance.
-        If USING_PYDANTIC, bypass validation by manually constructing the object.
-        """
-        def convert(value):
-            if isinstance(value, dict) and "_type" in value:
-                subcls = TYPE_REGISTRY.get(value["_type"])
-                if subcls:
-                    return subcls.from_typed_dict(value)
-            elif isinstance(value, list):
-                return [convert(v) for v in value]
-            return value
-
-        intype = "??"
+        """Recursively deserialize a _type-annotated dict into a dataclass instance."""
         # print(f"{using()} from_type_dict: converting: ", cls.__name__)
-        if isinstance(data, dict):
-            intype = data.get("_type", "NoneSpecified")
-            # print('\tincoming type is ', typing_of(data))
-        converted_data = {k: convert(v) for k, v in data.items() if k != "_type"}
-        # converted_data = {k: convert(v) for k, v in data.items() }
-        
         if USING_PYDANTIC:
-            instance = object.__new__(cls)
-            for field in cls.__dataclass_fields__.values():
-                name = field.name
-                value = converted_data.get(name, field.default if field.default is not MISSING else None)
-                setattr(instance, name, value)
-            instance.run_post_init_if_needed()
-            outtype = getattr(instance, "_type", "NO_TYPE")
-            # print(f'\tOutgoing type for {intype} instance is... ', typing_of(instance))
-            if outtype in watching:
-                print(outtype, " INSTANCE IS\n***\n", repr(instance))
-                print("***")
+            # only the fields are looked at, so only they are converted
+            return construct_from_plan(construction_plan(cls), data, convert=True)
 
-            return instance
+        converted_data = {k: typed_value(v) for k, v in data.items() if k != "_type"}
+        return cls.from_fields(converted_data)
+
+    @classmethod
+    def from_fields(cls, converted_data):
+        """Construct an instance from field values that are already objects.
+        If USING_PYDANTIC, bypass validation by manually constructing the object.
+        """
+        if USING_PYDANTIC:
+            return construct_from_plan(construction_plan(cls), converted_data, convert=False)
 
         else:
             # print("Converted data is: ")
@@ -242,6 +303,140 @@ class PydanticMixin():
         return TypeAdapter(cls).json_schema()
 
 
+# =============================================================================
+# 🏗 Construction plans: what from_typed_dict() needs to know about a class,
+#    worked out once per class instead of for every instance
+# =============================================================================
+@std_dataclass(frozen=True)
+class ConstructionPlan:
+    cls: type
+    # (field name, value if the dict doesn't have it) in field order.
+    # A field with a default_factory gets None, as it always has here;
+    # _type never comes from the dict (shared_post_init sets it)
+    fields: Tuple[Tuple[str, Any, bool], ...]  # (name, default, from_dict)
+    post_inits: Tuple[Callable, ...]
+
+
+construction_plans: Dict[type, ConstructionPlan] = {}
+
+
+def construction_plan(cls) -> ConstructionPlan:
+    plan = construction_plans.get(cls)
+    if plan is None:
+        fields = tuple(
+            (f.name, f.default if f.default is not MISSING else None, f.name != "_type")
+            for f in cls.__dataclass_fields__.values()
+        )
+        post_inits = tuple(
+            getattr(cls, name) for name in ("__post_init__", "shared_post_init") if hasattr(cls, name)
+        )
+        plan = ConstructionPlan(cls, fields, post_inits)
+        construction_plans[cls] = plan
+    return plan
+
+
+def typed_value(value):
+    """A value from a typed dict, with the _type-tagged dicts in it made into objects."""
+    if isinstance(value, dict):
+        if "_type" in value:
+            subcls = TYPE_REGISTRY.get(value["_type"])
+            if subcls:
+                return subcls.from_typed_dict(value)
+        return value
+    if isinstance(value, list):
+        return [typed_value(v) for v in value]
+    return value
+
+
+def construct_from_plan(plan: ConstructionPlan, data: Dict, convert: bool):
+    """Build plan.cls from data without validation; convert says whether data's values are still typed dicts."""
+    instance = object.__new__(plan.cls)
+    for (name, default, from_dict) in plan.fields:
+        if from_dict and name in data:
+            value = data[name]
+            if convert and isinstance(value, (dict, list)):
+                value = typed_value(value)
+        else:
+            value = default
+        setattr(instance, name, value)
+    for post_init in plan.post_inits:
+        post_init(instance)
+
+    if watching:
+        outtype = getattr(instance, "_type", "NO_TYPE")
+        if outtype in watching:
+            print(outtype, " INSTANCE IS\n***\n", repr(instance))
+            print("***")
+    return instance
+
+
+# =============================================================================
+# 📤 Serializers: to_typed_dict() for a class, generated once instead of
+#    working out the field names and their conversions for every instance
+# =============================================================================
+# Keyed on the class and the names in the instance's __dict__, in order - the
+# fields, plus whatever shared_post_init added (as_entered, words, ...), which
+# almost always come out the same for every instance of a class.
+# A class with __field_order__, or a compact one (no __dict__, just its slots),
+# has just the one, keyed on the class.
+serializers: Dict[Any, Callable] = {}
+
+SERIALIZED_AS_IS = frozenset([str, int, float, bool, type(None)])
+
+
+def typed_dict_value(value):
+    """A field value as it goes in a typed dict: objects become typed dicts, in lists and dicts too."""
+    if type(value) in SERIALIZED_AS_IS:
+        return value
+    if isinstance(value, PydanticMixin):
+        return value.to_typed_dict()
+    if isinstance(value, list):
+        return [typed_dict_value(v) for v in value]
+    if isinstance(value, dict):
+        return {k: typed_dict_value(v) for k, v in value.items()}
+    return value
+
+
+def make_serializer(cls, layout: Tuple[str, ...] = None) -> Callable:
+    """
+    Generates serialize(obj) for instances of cls with the given __dict__
+    layout (None for a class with __field_order__, or a compact one), caching
+    it in serializers.  It gives what get_field_order() and to_typed_dict()
+    always have: _type first, then each field but container and the _p properties, in order.
+    """
+    if hasattr(cls, "__field_order__"):
+        (names, key, source) = (cls.__field_order__, cls, "getattr")
+    elif layout is None:
+        (names, key, source) = (slot_names(cls), cls, "slot")
+    else:
+        (names, key, source) = (layout, (cls, layout), "dict")
+    names = [name for name in names if name != "container" and not name.endswith("_p")]
+
+    lines = ["def serialize(obj):", "    output = {'_type': getattr(obj, '_type', %r)}" % cls.__name__]
+    if source == "dict":
+        lines.append("    obj_dict = obj.__dict__")
+    for name in names:
+        if source == "slot":
+            # like a __dict__, a slot that's not been set isn't there
+            lines.append(f"    value = getattr(obj, {name!r}, UNSET)")
+            lines.append("    if value is not UNSET:")
+            lines.append(f"        output[{name!r}] = value if type(value) in AS_IS else typed_dict_value(value)")
+            continue
+        if source == "getattr" or hasattr(type(getattr(cls, name, None)), "__set__"):
+            lines.append(f"    value = getattr(obj, {name!r}, None)")
+        else:
+            # it's in the instance's __dict__, and no property gets in the way
+            lines.append(f"    value = obj_dict[{name!r}]")
+        lines.append(f"    output[{name!r}] = value if type(value) in AS_IS else typed_dict_value(value)")
+    lines.append("    return output")
+
+    namespace = {"typed_dict_value": typed_dict_value, "AS_IS": SERIALIZED_AS_IS, "UNSET": MISSING}
+    exec(compile("\n".join(lines) + "\n", f"<serializer for {cls.__name__}>", "exec"), namespace)
+    serializer = namespace["serialize"]
+    serializers[key] = serializer
+    return serializer
+
+
 # =============================================================================
 # 🔁 Deserialize from dict with _type-dispatching
 # =============================================================================
@@ -265,6 +460,7 @@ def gen_schema(the_model, model_name, schema_dir):
     class_schema = the_model.model_json_schema()
     schema_yaml = fmk.as_yaml(class_schema, warnings=False)
     fmk.write_text(f"{schema_dir}/{model_name}_schema.yaml", schema_yaml)
+    return class_schema
 
 
 